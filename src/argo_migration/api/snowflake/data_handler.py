@@ -6,6 +6,20 @@ from typing import Optional, Dict, Any
 import pandas as pd
 import numpy as np
 
+# fetch_pandas_all needs pyarrow (installed by the connector's [pandas] extra)
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Raised by fetch_pandas_all when the result is not in Arrow format
+try:
+    from snowflake.connector.errors import NotSupportedError
+except ImportError:
+    NotSupportedError = None
+_ARROW_FALLBACK_ERRORS = tuple(error for error in (NotSupportedError, ImportError) if error is not None)
+
 logger = logging.getLogger(__name__)
 
 
@@ -141,16 +155,12 @@ class SnowflakeDataHandler:
             logger.info(f"🔍 Executing query...")
             
             cursor = self.connection.cursor()
-            cursor.execute(query)
-            
-            # Get results
-            results = cursor.fetchall()
-            columns = [desc[0] for desc in cursor.description]
-            
-            cursor.close()
+            try:
+                cursor.execute(query)
+                df = self._fetch_dataframe(cursor)
+            finally:
+                cursor.close()
             
-            # Convert to DataFrame
-            df = pd.DataFrame(results, columns=columns)
             logger.info(f"✅ Query executed successfully, returned {len(df)} rows")
             
             return df
@@ -159,6 +169,25 @@ class SnowflakeDataHandler:
             logger.error(f"❌ Query execution failed: {e}")
             return None
     
+    def _fetch_dataframe(self, cursor) -> pd.DataFrame:
+        """
+        Fetch the results of an executed cursor as a DataFrame.
+        
+        Uses the connector's Arrow result path (fetch_pandas_all), which builds typed
+        columns without creating a Python tuple per row. Falls back to fetchall only
+        when pyarrow is not installed or the result is not in Arrow format; any other
+        fetch error is raised, since the cursor may already be partly consumed.
+        """
+        if PYARROW_AVAILABLE:
+            try:
+                return cursor.fetch_pandas_all()
+            except _ARROW_FALLBACK_ERRORS as e:
+                logger.info(f"ℹ️  Arrow fetch unavailable, using fetchall: {e}")
+        
+        results = cursor.fetchall()
+        columns = [desc[0] for desc in cursor.description]
+        return pd.DataFrame(results, columns=columns)
+    
     def verify_upload(self, table_name: str, expected_rows: int) -> bool:
         """Verify that data was uploaded correctly."""
         try:
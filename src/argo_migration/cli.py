@@ -7,8 +7,10 @@ This is a simplified CLI that uses the new modular API structure.
 
 import os
 import sys
+import queue
 import argparse
 import logging
+import logging.handlers
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -61,7 +63,7 @@ def test_snowflake_connection():
         return False
 
 
-def migrate_single_dataset(dataset_id: str, table_name: str):
+def migrate_single_dataset(dataset_id: str, table_name: str, chunk_rows: int = None):
     """Migrate a single dataset from Domo to Snowflake."""
     try:
         from .api.domo import DomoHandler
@@ -85,7 +87,7 @@ def migrate_single_dataset(dataset_id: str, table_name: str):
             
             # Create orchestrator and migrate
             orchestrator = MigrationOrchestrator(domo, sf)
-            success = orchestrator.migrate_dataset(dataset_id, table_name=table_name)
+            success = orchestrator.migrate_dataset(dataset_id, table_name=table_name, chunk_rows=chunk_rows)
             
             if success:
                 logger.info("🎉 Migration completed successfully!")
@@ -279,11 +281,12 @@ def compare_datasets(domo_dataset_id: str, snowflake_table: str, key_columns: li
 
 
 def compare_from_spreadsheet(spreadsheet_id: str = None, sheet_name: str = None, 
-                           credentials_path: str = None, sampling_method: str = "random"):
+                           credentials_path: str = None, sampling_method: str = "random",
+                           max_workers: int = None):
     """Compare multiple datasets from Google Sheets configuration."""
     try:
-        from .services.comparison.dataset_comparator import DatasetComparator
-        from .utils.common import get_env_config, setup_dual_connections
+        from .services.comparison.dataset_comparator import get_comparator
+        from .utils.common import get_env_config
         
         logger.info("🚀 Starting spreadsheet-based comparisons...")
         
@@ -325,23 +328,16 @@ def compare_from_spreadsheet(spreadsheet_id: str = None, sheet_name: str = None,
         for key, value in config.items():
             logger.info(f"   {key}: {value}")
         
-        # Setup connections first
+        # Reuse the process-wide connected comparator (connects on first use)
         logger.info("🔗 Setting up connections...")
-        success, domo_handler, snowflake_handler = setup_dual_connections()
-        
-        if not success:
-            logger.error("❌ Failed to setup connections")
+        try:
+            comparator = get_comparator()
+        except Exception as e:
+            logger.error(f"❌ Failed to setup connections: {e}")
             return False
         
         logger.info("✅ Connections established")
         
-        # Initialize comparator with existing connections
-        comparator = DatasetComparator()
-        comparator.domo_handler = domo_handler
-        comparator.snowflake_handler = snowflake_handler
-        comparator._domo_connected = True
-        comparator._snowflake_connected = True
-        
         try:
             # Run comparisons from spreadsheet
             logger.info("📊 Running comparisons from spreadsheet...")
@@ -349,7 +345,8 @@ def compare_from_spreadsheet(spreadsheet_id: str = None, sheet_name: str = None,
                 spreadsheet_id=spreadsheet_id,
                 sheet_name=sheet_name,
                 credentials_path=credentials_path,
-                sampling_method=sampling_method
+                sampling_method=sampling_method,
+                max_workers=max_workers
             )
             
             # Analyze results
@@ -379,9 +376,11 @@ def compare_from_spreadsheet(spreadsheet_id: str = None, sheet_name: str = None,
                 return True  # Not an error, just differences found
                 
         finally:
-            # Cleanup connections
+            # Connections stay open for reuse (closed at exit), but this command's debug
+            # exports and file logs are flushed now rather than at interpreter shutdown
             try:
-                comparator.cleanup()
+                comparator.wait_for_exports()
+                comparator.file_logger.close_loggers()
             except:
                 pass  # Ignore cleanup errors
         
@@ -390,11 +389,12 @@ def compare_from_spreadsheet(spreadsheet_id: str = None, sheet_name: str = None,
         return False
 
 
-def compare_from_inventory(credentials_path: str = None, sampling_method: str = "random"):
+def compare_from_inventory(credentials_path: str = None, sampling_method: str = "random",
+                           max_workers: int = None):
     """Compare datasets from inventory spreadsheet."""
     try:
-        from .services.comparison.dataset_comparator import DatasetComparator
-        from .utils.common import get_env_config, setup_dual_connections
+        from .services.comparison.dataset_comparator import get_comparator
+        from .utils.common import get_env_config
         
         logger.info("🚀 Starting inventory-based comparisons...")
         
@@ -430,29 +430,23 @@ def compare_from_inventory(credentials_path: str = None, sampling_method: str =
         for key, value in config.items():
             logger.info(f"   {key}: {value}")
         
-        # Setup connections first
+        # Reuse the process-wide connected comparator (connects on first use)
         logger.info("🔗 Setting up connections...")
-        success, domo_handler, snowflake_handler = setup_dual_connections()
-        
-        if not success:
-            logger.error("❌ Failed to setup connections")
+        try:
+            comparator = get_comparator()
+        except Exception as e:
+            logger.error(f"❌ Failed to setup connections: {e}")
             return False
         
         logger.info("✅ Connections established")
         
-        # Initialize comparator with existing connections
-        comparator = DatasetComparator()
-        comparator.domo_handler = domo_handler
-        comparator.snowflake_handler = snowflake_handler
-        comparator._domo_connected = True
-        comparator._snowflake_connected = True
-        
         try:
             # Run comparisons from inventory
             logger.info("📊 Running comparisons from inventory...")
             results = comparator.compare_from_inventory(
                 credentials_path=credentials_path,
-                sampling_method=sampling_method
+                sampling_method=sampling_method,
+                max_workers=max_workers
             )
             
             # Analyze results
@@ -482,9 +476,11 @@ def compare_from_inventory(credentials_path: str = None, sampling_method: str =
                 return True  # Not an error, just differences found
                 
         finally:
-            # Cleanup connections
+            # Connections stay open for reuse (closed at exit), but this command's debug
+            # exports and file logs are flushed now rather than at interpreter shutdown
             try:
-                comparator.cleanup()
+                comparator.wait_for_exports()
+                comparator.file_logger.close_loggers()
             except:
                 pass  # Ignore cleanup errors
         
@@ -498,6 +494,7 @@ def generate_stg_files(database: str, schema: str = "TEMP_ARGO_RAW", output_dir:
     try:
         from .api.domo import DomoHandler
         from .services.stg_handler import StgFileGenerator
+        from .utils.create_stg_sql_file import BASIC_STG_SCHEMA
         
         logger.info("🚀 Starting STG file generation...")
         
@@ -543,21 +540,15 @@ def generate_stg_files(database: str, schema: str = "TEMP_ARGO_RAW", output_dir:
             logger.info("🧪 Use without --dry-run to actually generate files")
             return True
         
-        # Generate STG files
-        configs = []
-        for dataset in datasets:
-            # Create basic schema for demo
-            basic_schema = [
-                {'name': 'id', 'type': 'STRING'},
-                {'name': 'created_date', 'type': 'DATE'},
-                {'name': 'value', 'type': 'NUMBER'}
-            ]
-            
-            configs.append({
+        # Generate STG files (all datasets share the same demo schema)
+        configs = [
+            {
                 'dataset_id': dataset.get('id'),
                 'dataset_name': dataset.get('name', ''),
-                'schema': basic_schema
-            })
+                'schema': BASIC_STG_SCHEMA
+            }
+            for dataset in datasets
+        ]
         
         logger.info(f"📄 Generating STG files for {len(configs)} datasets...")
         results = generator.generate_batch_stg_files(configs)
@@ -598,6 +589,48 @@ def _sanitize_name(name: str) -> str:
     return sanitized if sanitized else "unknown"
 
 
+def _configure_verbosity(quiet: bool = False, verbose: bool = False):
+    """Adjust root logging level (and format in quiet mode) from CLI flags."""
+    root_logger = logging.getLogger()
+    
+    if quiet:
+        root_logger.setLevel(logging.WARNING)
+        # Skip the asctime formatting for the few records still emitted
+        for handler in root_logger.handlers:
+            handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+    elif verbose:
+        root_logger.setLevel(logging.DEBUG)
+    else:
+        root_logger.setLevel(logging.INFO)
+
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """Route root log records through a queue so formatting and I/O run on a background thread."""
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    log_queue = queue.SimpleQueue()
+    
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _stop_log_listener(listener: logging.handlers.QueueListener):
+    """Flush queued records and restore the original root handlers."""
+    listener.stop()
+    
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root_logger.removeHandler(handler)
+    for handler in listener.handlers:
+        root_logger.addHandler(handler)
+
+
 def main():
     """Main CLI function."""
     parser = argparse.ArgumentParser(
@@ -607,6 +640,7 @@ def main():
 Examples:
     # Test connections
     python cli.py test-connections
+    python cli.py --quiet test-connections
     python cli.py test-domo
     python cli.py test-snowflake
     
@@ -616,6 +650,7 @@ Examples:
     
     # Migrate datasets
     python cli.py migrate --dataset-id 12345 --table-name my_table
+    python cli.py migrate --dataset-id 12345 --table-name my_table --chunk-rows 50000
     python cli.py migrate --batch-file mappings.json
     
     # Compare data
@@ -644,6 +679,10 @@ Environment Variables Required:
         """
     )
     
+    verbosity_group = parser.add_mutually_exclusive_group()
+    verbosity_group.add_argument('-q', '--quiet', action='store_true', help='Only show warnings and errors')
+    verbosity_group.add_argument('-v', '--verbose', action='store_true', help='Show debug output')
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Test commands
@@ -662,6 +701,7 @@ Environment Variables Required:
     migrate_group.add_argument('--batch-file', help='JSON file with dataset mappings')
     
     migrate_parser.add_argument('--table-name', help='Target Snowflake table (required for single dataset)')
+    migrate_parser.add_argument('--chunk-rows', type=int, help='Stream the dataset in chunks of N rows instead of loading it fully into memory')
     
     # Compare commands
     compare_parser = subparsers.add_parser('compare', help='Compare Domo dataset with Snowflake table')
@@ -676,11 +716,13 @@ Environment Variables Required:
     compare_spreadsheet_parser.add_argument('--sheet-name', help='Sheet name (default: QA - Test)')
     compare_spreadsheet_parser.add_argument('--credentials', help='Path to Google Sheets credentials JSON file')
     compare_spreadsheet_parser.add_argument('--sampling-method', choices=['random', 'ordered'], default='random', help='Sampling method')
+    compare_spreadsheet_parser.add_argument('--workers', type=int, help='Concurrent comparisons (default: ARGO_COMPARE_WORKERS or 1)')
     
     # Compare from inventory
     compare_inventory_parser = subparsers.add_parser('compare-inventory', help='Compare datasets from inventory spreadsheet')
     compare_inventory_parser.add_argument('--credentials', help='Path to Google Sheets credentials JSON file')
     compare_inventory_parser.add_argument('--sampling-method', choices=['random', 'ordered'], default='random', help='Sampling method')
+    compare_inventory_parser.add_argument('--workers', type=int, help='Concurrent comparisons (default: ARGO_COMPARE_WORKERS or 1)')
     
     # STG generation
     stg_parser = subparsers.add_parser('generate-stg', help='Generate STG files')
@@ -695,6 +737,9 @@ Environment Variables Required:
         parser.print_help()
         return 1
     
+    _configure_verbosity(args.quiet, args.verbose)
+    log_listener = _start_log_listener()
+    
     logger.info("🚀 Argo Migration Tools - Simple CLI")
     
     try:
@@ -720,7 +765,7 @@ Environment Variables Required:
                 if not args.table_name:
                     logger.error("❌ --table-name is required when using --dataset-id")
                     return 1
-                success = migrate_single_dataset(args.dataset_id, args.table_name)
+                success = migrate_single_dataset(args.dataset_id, args.table_name, args.chunk_rows)
             elif args.batch_file:
                 success = migrate_batch_datasets(args.batch_file)
             else:
@@ -743,14 +788,16 @@ Environment Variables Required:
                 spreadsheet_id=args.spreadsheet_id,
                 sheet_name=args.sheet_name,
                 credentials_path=args.credentials,
-                sampling_method=args.sampling_method
+                sampling_method=args.sampling_method,
+                max_workers=args.workers
             )
             return 0 if success else 1
             
         elif args.command == 'compare-inventory':
             success = compare_from_inventory(
                 credentials_path=args.credentials,
-                sampling_method=args.sampling_method
+                sampling_method=args.sampling_method,
+                max_workers=args.workers
             )
             return 0 if success else 1
             
@@ -773,6 +820,8 @@ Environment Variables Required:
     except Exception as e:
         logger.error(f"❌ Unexpected error: {e}")
         return 1
+    finally:
+        _stop_log_listener(log_listener)
 
 
 if __name__ == "__main__":
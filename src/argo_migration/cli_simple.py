@@ -6,7 +6,11 @@ This is a simplified CLI that uses the new modular API structure.
 """
 
 import os
+import re
 import sys
+import json
+import time
+import asyncio
 import argparse
 import logging
 from pathlib import Path
@@ -22,6 +26,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Datasets written per stdout batch by list_datasets
+LIST_OUTPUT_BATCH = 1000
+
+# Dataset listing cache (shared across CLI invocations)
+DATASET_CACHE_DIR = Path.home() / ".cache" / "argo-migration"
+DATASET_CACHE_TTL_SECONDS = int(os.getenv("ARGO_DATASET_CACHE_TTL", "3600"))
+_datasets_memo = {}
+
+# Patterns used by _sanitize_name
+_RE_NONWORD = re.compile(r'[^\w\s-]')
+_RE_SEPARATORS = re.compile(r'[-\s]+')
+_RE_DUP_UNDERSCORES = re.compile(r'_+')
+# ASCII fast path: map every non-word character straight to '_'
+_SANITIZE_TABLE = str.maketrans({
+    chr(code): '_' for code in range(128) if not (chr(code).isalnum() or chr(code) == '_')
+})
+
 
 def test_domo_connection():
     """Test Domo connection."""
@@ -61,25 +82,53 @@ def test_snowflake_connection():
         return False
 
 
+async def _connect_handlers():
+    """
+    Authenticate with Domo and connect to Snowflake concurrently.
+    
+    Both are blocking network handshakes, so each runs on a worker thread and the
+    total wait is the slower of the two instead of their sum.
+    
+    Returns:
+        Tuple of (domo_handler, snowflake_handler, snowflake_connected)
+    """
+    from api.domo import DomoHandler
+    from api.snowflake import SnowflakeHandler
+    
+    domo = DomoHandler()
+    sf = SnowflakeHandler()
+    
+    domo_result, sf_result = await asyncio.gather(
+        asyncio.to_thread(domo.authenticate),
+        asyncio.to_thread(sf.setup_connection),
+        return_exceptions=True
+    )
+    
+    if isinstance(domo_result, Exception):
+        logger.error(f"❌ Domo authentication failed: {domo_result}")
+    if isinstance(sf_result, Exception):
+        logger.error(f"❌ Snowflake connection failed: {sf_result}")
+        sf_result = False
+    
+    return domo, sf, sf_result
+
+
 def migrate_single_dataset(dataset_id: str, table_name: str):
     """Migrate a single dataset from Domo to Snowflake."""
     try:
-        from api.domo import DomoHandler
-        from api.snowflake import SnowflakeHandler
         from services.domo_to_snowflake import MigrationOrchestrator
         
         logger.info(f"🚀 Starting migration: {dataset_id} -> {table_name}")
         
         # Setup handlers
-        domo = DomoHandler()
-        domo.authenticate()
+        domo, sf, sf_connected = asyncio.run(_connect_handlers())
         
-        if not domo.is_authenticated:
-            logger.error("❌ Domo authentication failed")
-            return False
-        
-        with SnowflakeHandler() as sf:
-            if not sf.is_connected:
+        try:
+            if not domo.is_authenticated:
+                logger.error("❌ Domo authentication failed")
+                return False
+            
+            if not sf_connected:
                 logger.error("❌ Snowflake connection failed")
                 return False
             
@@ -93,13 +142,56 @@ def migrate_single_dataset(dataset_id: str, table_name: str):
             else:
                 logger.error("❌ Migration failed!")
                 return False
+        finally:
+            sf.cleanup()
                 
     except Exception as e:
         logger.error(f"❌ Migration failed: {e}")
         return False
 
 
-def list_datasets(batch_size: int = 50):
+def _get_datasets_cached(domo, batch_size: int, use_cache: bool = True) -> list:
+    """
+    Get all Domo datasets, reusing a recent listing when available.
+    
+    Listings are memoized in-process and persisted to DATASET_CACHE_DIR keyed on
+    (DOMO_INSTANCE, batch_size); a cached listing is reused while it is younger
+    than DATASET_CACHE_TTL_SECONDS.
+    """
+    instance = os.getenv("DOMO_INSTANCE") or "default"
+    key = (instance, batch_size)
+    cache_file = DATASET_CACHE_DIR / f"datasets_{_sanitize_name(instance)}_{batch_size}.json"
+    
+    if use_cache:
+        if key in _datasets_memo:
+            return _datasets_memo[key]
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            age = time.time() - cached['timestamp']
+            if age < DATASET_CACHE_TTL_SECONDS:
+                logger.info(f"📦 Using cached dataset listing ({int(age)}s old, use --no-cache to refresh)")
+                _datasets_memo[key] = cached['datasets']
+                return cached['datasets']
+        except (OSError, ValueError, KeyError):
+            pass  # Missing or unreadable cache, fetch from Domo
+    
+    datasets = domo.get_all_datasets(batch_size=batch_size)
+    
+    if datasets:
+        try:
+            DATASET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'timestamp': time.time(), 'datasets': datasets}, f, default=str)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write dataset cache: {e}")
+    
+    _datasets_memo[key] = datasets
+    return datasets
+
+
+def list_datasets(batch_size: int = 50, use_cache: bool = True):
     """List Domo datasets."""
     try:
         from api.domo import DomoHandler
@@ -113,7 +205,7 @@ def list_datasets(batch_size: int = 50):
             logger.error("❌ Domo authentication failed")
             return False
         
-        datasets = domo.get_all_datasets(batch_size=batch_size)
+        datasets = _get_datasets_cached(domo, batch_size, use_cache)
         
         if not datasets:
             logger.warning("⚠️ No datasets found")
@@ -121,17 +213,24 @@ def list_datasets(batch_size: int = 50):
         
         logger.info(f"📊 Found {len(datasets)} datasets:")
         
+        # Write the listing straight to stdout in batches rather than 3 log records per dataset
+        lines = []
         for i, dataset in enumerate(datasets, 1):
             dataset_id = dataset.get('id', 'N/A')
             dataset_name = dataset.get('name', 'N/A')
             row_count = dataset.get('rowCount', 0) or dataset.get('row_count', 0)
             
-            logger.info(f"   {i:3d}. {dataset_name}")
-            logger.info(f"        ID: {dataset_id}")
-            logger.info(f"        Rows: {row_count:,}")
+            lines.append(f"   {i:3d}. {dataset_name}\n        ID: {dataset_id}\n        Rows: {row_count:,}\n")
             
             if i % 5 == 0:  # Add spacing every 5 datasets
-                logger.info("")
+                lines.append("\n")
+            
+            if i % LIST_OUTPUT_BATCH == 0:
+                sys.stdout.write(''.join(lines))
+                lines.clear()
+        
+        sys.stdout.write(''.join(lines))
+        sys.stdout.flush()
         
         return True
         
@@ -140,11 +239,13 @@ def list_datasets(batch_size: int = 50):
         return False
 
 
-def generate_stg_files(database: str, schema: str = "TEMP_ARGO_RAW", output_dir: str = "sql/stg", dry_run: bool = False):
+def generate_stg_files(database: str, schema: str = "TEMP_ARGO_RAW", output_dir: str = "sql/stg",
+                       dry_run: bool = False, use_cache: bool = True):
     """Generate STG files for datasets."""
     try:
         from api.domo import DomoHandler
         from services.stg_handler import StgFileGenerator
+        from utils.create_stg_sql_file import BASIC_STG_SCHEMA
         
         logger.info("🚀 Starting STG file generation...")
         
@@ -172,7 +273,7 @@ def generate_stg_files(database: str, schema: str = "TEMP_ARGO_RAW", output_dir:
         
         # Get datasets
         logger.info("📊 Fetching datasets...")
-        datasets = domo.get_all_datasets(batch_size=10)  # Start small
+        datasets = _get_datasets_cached(domo, 10, use_cache)  # Start small
         
         if not datasets:
             logger.warning("⚠️ No datasets found")
@@ -190,21 +291,15 @@ def generate_stg_files(database: str, schema: str = "TEMP_ARGO_RAW", output_dir:
             logger.info("🧪 Use without --dry-run to actually generate files")
             return True
         
-        # Generate STG files
-        configs = []
-        for dataset in datasets:
-            # Create basic schema for demo
-            basic_schema = [
-                {'name': 'id', 'type': 'STRING'},
-                {'name': 'created_date', 'type': 'DATE'},
-                {'name': 'value', 'type': 'NUMBER'}
-            ]
-            
-            configs.append({
+        # Generate STG files (all datasets share the demo schema)
+        configs = [
+            {
                 'dataset_id': dataset.get('id'),
                 'dataset_name': dataset.get('name', ''),
-                'schema': basic_schema
-            })
+                'schema': BASIC_STG_SCHEMA
+            }
+            for dataset in datasets
+        ]
         
         logger.info(f"📄 Generating STG files for {len(configs)} datasets...")
         results = generator.generate_batch_stg_files(configs)
@@ -236,10 +331,13 @@ def _sanitize_name(name: str) -> str:
     if not name:
         return "unknown"
     
-    import re
-    sanitized = re.sub(r'[^\w\s-]', '_', name.lower())
-    sanitized = re.sub(r'[-\s]+', '_', sanitized)
-    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = name.lower()
+    if sanitized.isascii():
+        sanitized = sanitized.translate(_SANITIZE_TABLE)
+    else:
+        sanitized = _RE_NONWORD.sub('_', sanitized)
+        sanitized = _RE_SEPARATORS.sub('_', sanitized)
+    sanitized = _RE_DUP_UNDERSCORES.sub('_', sanitized)
     sanitized = sanitized.strip('_')
     
     return sanitized if sanitized else "unknown"
@@ -259,6 +357,7 @@ Examples:
     # List datasets
     python cli_simple.py list-datasets
     python cli_simple.py list-datasets --batch-size 20
+    python cli_simple.py list-datasets --no-cache
     
     # Migrate dataset
     python cli_simple.py migrate --dataset-id 12345 --table-name my_table
@@ -276,6 +375,9 @@ Environment Variables Required:
     SNOWFLAKE_DATABASE: Snowflake database name
     SNOWFLAKE_SCHEMA: Snowflake schema name
     SNOWFLAKE_WAREHOUSE: Snowflake warehouse name
+
+Optional Environment Variables:
+    ARGO_DATASET_CACHE_TTL: Seconds to reuse a cached dataset listing (default: 3600)
         """
     )
     
@@ -288,6 +390,7 @@ Environment Variables Required:
     # List datasets
     list_parser = subparsers.add_parser('list-datasets', help='List Domo datasets')
     list_parser.add_argument('--batch-size', type=int, default=50, help='Batch size for fetching')
+    list_parser.add_argument('--no-cache', action='store_true', help='Ignore the cached dataset listing')
     
     # Migration
     migrate_parser = subparsers.add_parser('migrate', help='Migrate single dataset')
@@ -300,6 +403,7 @@ Environment Variables Required:
     stg_parser.add_argument('--schema', default='TEMP_ARGO_RAW', help='Snowflake schema')
     stg_parser.add_argument('--output-dir', default='sql/stg', help='Output directory')
     stg_parser.add_argument('--dry-run', action='store_true', help='Show what would be generated')
+    stg_parser.add_argument('--no-cache', action='store_true', help='Ignore the cached dataset listing')
     
     args = parser.parse_args()
     
@@ -320,7 +424,7 @@ Environment Variables Required:
             return 0 if success else 1
             
         elif args.command == 'list-datasets':
-            success = list_datasets(args.batch_size)
+            success = list_datasets(args.batch_size, use_cache=not args.no_cache)
             return 0 if success else 1
             
         elif args.command == 'migrate':
@@ -332,7 +436,8 @@ Environment Variables Required:
                 database=args.database,
                 schema=args.schema,
                 output_dir=args.output_dir,
-                dry_run=args.dry_run
+                dry_run=args.dry_run,
+                use_cache=not args.no_cache
             )
             return 0 if success else 1
             
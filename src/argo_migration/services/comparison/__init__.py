@@ -6,7 +6,7 @@ including schema comparison, data sampling, and comprehensive reporting.
 """
 
 # Main exports for backward compatibility
-from .dataset_comparator import DatasetComparator
+from .dataset_comparator import DatasetComparator, get_comparator, close_shared_comparators
 
 # Individual component exports for advanced usage
 from .schema_comparator import SchemaComparator
@@ -15,6 +15,8 @@ from .data_comparator import DataComparator
 
 __all__ = [
     'DatasetComparator',
+    'get_comparator',
+    'close_shared_comparators',
     'SchemaComparator',
     'RowCountComparator',
     'DataComparator',
@@ -5,14 +5,35 @@ This module provides functionality to execute multiple dataset comparisons
 based on the existing inventory spreadsheet system.
 """
 
+import io
 import os
+import json
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 import pandas as pd
 
-from ....utils.common import get_env_config
-from ....utils.gsheets import GoogleSheets, READ_WRITE_SCOPES
+from ....utils.common import TRUTHY_VALUES, get_env_config
 from ....utils.file_logger import start_logging_session, end_logging_session
+from ..domo_cache import DomoCache
+from ..report_cache import ReportCache
+from ..dataset_comparator import get_connection_key
+from .worker_pool import WorkerComparators, get_compare_workers, iter_completed
+
+# The Google Sheets client is imported when a run actually needs it
+if TYPE_CHECKING:
+    from ....utils.gsheets import GoogleSheets
+
+# Raw inventory values keyed on the spreadsheet's modification time
+INVENTORY_CACHE_DIR = Path.home() / ".cache" / "argo-migration" / "inventory"
+
+# Accepted header names (normalized: stripped + lowercase), in priority order
+_INVENTORY_COLUMN_ALIASES = {
+    'dataset_id': ('output id', 'output_id', 'dataset id', 'dataset_id', 'domo dataset id'),
+    'table_name': ('model name', 'model_name', 'table name', 'table_name', 'snowflake table'),
+    'key_columns': ('key columns', 'key_columns', 'keys'),
+}
 
 
 class InventoryComparisonRunner:
@@ -29,7 +50,7 @@ class InventoryComparisonRunner:
         self.logger = logging.getLogger("InventoryRunner")
     
     def run_comparisons(self, credentials_path: str = None, sampling_method: str = "random", 
-                       export_debug_tables: bool = False) -> Dict[str, Any]:
+                       export_debug_tables: bool = False, max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Compare datasets from the existing inventory spreadsheet.
         
@@ -38,10 +59,14 @@ class InventoryComparisonRunner:
         - Model Name: Snowflake table name  
         - Key Columns: Comma-separated list of key columns
         
+        When COMPARISON_EARLY_EXIT is enabled, entries whose schema or row count already
+        mismatch skip the data comparison.
+        
         Args:
             credentials_path: Path to Google Sheets credentials file
             sampling_method: Sampling method ('random' or 'ordered')
-            export_debug_tables: If True, export the comparison tables as CSV files to results/debug/ for debugging
+            export_debug_tables: If True, export the comparison tables (Parquet by default, see DEBUG_EXPORT_FORMAT) to results/debug/ for debugging
+            max_workers: Number of concurrent comparisons (uses ARGO_COMPARE_WORKERS if None)
             
         Returns:
             Dictionary with comparison results summary
@@ -86,7 +111,7 @@ class InventoryComparisonRunner:
             
             # Process comparisons
             results = self._process_inventory_comparisons(
-                valid_df, column_mappings, sampling_method, export_debug_tables
+                valid_df, column_mappings, sampling_method, export_debug_tables, max_workers
             )
             
             # Log summary
@@ -106,8 +131,10 @@ class InventoryComparisonRunner:
             # End logging session
             end_logging_session()
     
-    def _setup_gsheets_client(self, credentials_path: str = None) -> GoogleSheets:
+    def _setup_gsheets_client(self, credentials_path: str = None) -> "GoogleSheets":
         """Setup Google Sheets client."""
+        from ....utils.gsheets import get_gsheets_client, READ_WRITE_SCOPES, DRIVE_METADATA_SCOPE
+        
         if not credentials_path:
             credentials_path = os.getenv("GOOGLE_SHEETS_CREDENTIALS_FILE")
         
@@ -117,69 +144,135 @@ class InventoryComparisonRunner:
         if not os.path.exists(credentials_path):
             raise Exception(f"Google Sheets credentials file not found: {credentials_path}")
         
-        return GoogleSheets(
+        return get_gsheets_client(
             credentials_path=credentials_path,
-            scopes=READ_WRITE_SCOPES
+            scopes=READ_WRITE_SCOPES + [DRIVE_METADATA_SCOPE]
         )
     
-    def _read_inventory_data(self, gsheets_client: GoogleSheets, 
+    def _read_inventory_data(self, gsheets_client: "GoogleSheets", 
                            spreadsheet_id: str, sheet_name: str) -> tuple:
         """Read and parse inventory data."""
         # Read inventory data
         self.logger.info(f"📖 Reading inventory data from {sheet_name}...")
-        data = gsheets_client.read_range(spreadsheet_id, f"{sheet_name}!A:Z")
+        headers, columns = self._read_inventory_values(gsheets_client, spreadsheet_id, sheet_name)
         
-        if not data or len(data) < 2:
+        num_rows = max((len(column) for column in columns), default=0)
+        if not headers or num_rows == 0:
             raise Exception(f"No data found in sheet '{sheet_name}' or missing headers")
         
-        # Convert to DataFrame
-        headers = data[0]
-        rows = data[1:]
+        # Pad columns to the same length (the API omits trailing blank cells)
+        df = pd.DataFrame({
+            header: column + [''] * (num_rows - len(column))
+            for header, column in zip(headers, columns)
+        })
         
-        # Normalize row lengths to match header length
-        num_cols = len(headers)
-        normalized_rows = []
-        for row in rows:
-            # Ensure each row has the same number of columns as headers
-            normalized_row = row + [''] * (num_cols - len(row)) if len(row) < num_cols else row[:num_cols]
-            normalized_rows.append(normalized_row)
-        
-        df = pd.DataFrame(normalized_rows, columns=headers)
-        
-        # Remove empty rows
-        df = df.dropna(how='all')
+        # Remove empty rows, keeping the original positions for sheet row numbers
+        df = df[df.ne('').any(axis=1)]
         
         self.logger.info(f"📊 Found {len(df)} inventory entries")
         
         # Find column mappings
-        column_mappings = self._find_inventory_column_mappings(df)
+        column_mappings = self._find_inventory_column_mappings(df.columns)
         
         return df, column_mappings
     
-    def _find_inventory_column_mappings(self, df: pd.DataFrame) -> Dict[str, str]:
-        """Find column mappings in inventory spreadsheet."""
-        column_mappings = {}
+    def _read_inventory_values(self, gsheets_client: "GoogleSheets",
+                               spreadsheet_id: str, sheet_name: str) -> tuple:
+        """
+        Read the required inventory columns, reusing a cached copy while the spreadsheet is unchanged.
+        
+        The cache is keyed on (spreadsheet_id, sheet_name) and validated against the
+        spreadsheet's Drive modifiedTime; without that metadata the sheet is always read.
+        
+        Returns:
+            Tuple of (headers, columns) with one list of cell values per header
+        """
+        modified_time = gsheets_client.get_modified_time(spreadsheet_id)
+        cache_file = INVENTORY_CACHE_DIR / f"{spreadsheet_id}.json"
+        
+        if modified_time:
+            cached = self._load_inventory_cache(cache_file)
+            if cached and cached.get('sheet') == sheet_name and cached.get('modified_time') == modified_time:
+                self.logger.info(f"📦 Inventory unchanged since {modified_time}, using cached data")
+                return cached['headers'], cached['columns']
+        
+        headers, columns = self._fetch_inventory_columns(gsheets_client, spreadsheet_id, sheet_name)
+        
+        if modified_time and columns:
+            try:
+                INVENTORY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                with open(cache_file, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'sheet': sheet_name,
+                        'modified_time': modified_time,
+                        'headers': headers,
+                        'columns': columns,
+                    }, f)
+            except OSError as e:
+                self.logger.warning(f"⚠️  Could not write inventory cache: {e}")
         
-        # Find Output ID column (Domo dataset ID)
-        possible_dataset_id_columns = ['Output ID', 'output_id', 'Dataset ID', 'dataset_id', 'Domo Dataset ID']
-        for col in possible_dataset_id_columns:
-            if col in df.columns:
-                column_mappings['dataset_id'] = col
-                break
-        
-        # Find Model Name column (Snowflake table name)
-        possible_table_columns = ['Model Name', 'model_name', 'Table Name', 'table_name', 'Snowflake Table']
-        for col in possible_table_columns:
-            if col in df.columns:
-                column_mappings['table_name'] = col
-                break
-        
-        # Find Key Columns column
-        possible_key_columns = ['Key Columns', 'key_columns', 'Keys', 'keys']
-        for col in possible_key_columns:
-            if col in df.columns:
-                column_mappings['key_columns'] = col
-                break
+        return headers, columns
+    
+    def _fetch_inventory_columns(self, gsheets_client: "GoogleSheets",
+                                 spreadsheet_id: str, sheet_name: str) -> tuple:
+        """
+        Fetch the mapped inventory columns.
+        
+        Prefers a CSV export parsed by pandas' C reader; when the export is not
+        available, reads the header row and then only the mapped columns in one
+        batchGet request.
+        """
+        from ....utils.gsheets import column_letter
+        
+        csv_bytes = gsheets_client.export_csv(spreadsheet_id, sheet_name)
+        if csv_bytes:
+            # Keep blank lines so positions still match sheet row numbers
+            csv_df = pd.read_csv(
+                io.BytesIO(csv_bytes), dtype=str, keep_default_na=False,
+                skip_blank_lines=False, engine='c'
+            )
+            headers = list(self._find_inventory_column_mappings(csv_df.columns).values())
+            return headers, [csv_df[header].tolist() for header in headers]
+        
+        header_row = gsheets_client.read_range(spreadsheet_id, f"{sheet_name}!1:1")
+        if not header_row:
+            return [], []
+        
+        all_headers = header_row[0]
+        headers = list(self._find_inventory_column_mappings(all_headers).values())
+        letters = [column_letter(all_headers.index(header)) for header in headers]
+        
+        value_ranges = gsheets_client.read_ranges(
+            spreadsheet_id,
+            [f"{sheet_name}!{letter}2:{letter}" for letter in letters],
+            major_dimension="COLUMNS"
+        )
+        if len(value_ranges) != len(headers):
+            return headers, []
+        
+        # Each single-column range comes back as [[v1, v2, ...]], or [] when blank
+        return headers, [values[0] if values else [] for values in value_ranges]
+    
+    def _load_inventory_cache(self, cache_file: Path) -> Optional[dict]:
+        """Load a cached inventory read, ignoring missing or corrupt files."""
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _find_inventory_column_mappings(self, headers: List[str]) -> Dict[str, str]:
+        """Find column mappings in inventory spreadsheet headers."""
+        # Normalized header -> actual header (first occurrence wins)
+        normalized_columns = {}
+        for col in headers:
+            normalized_columns.setdefault(str(col).strip().lower(), col)
+        
+        column_mappings = {}
+        for mapping_key, aliases in _INVENTORY_COLUMN_ALIASES.items():
+            match = next((normalized_columns[alias] for alias in aliases if alias in normalized_columns), None)
+            if match is not None:
+                column_mappings[mapping_key] = match
         
         # Validate required columns
         required_columns = ['dataset_id', 'table_name', 'key_columns']
@@ -191,86 +284,112 @@ class InventoryComparisonRunner:
     
     def _filter_valid_entries(self, df: pd.DataFrame, column_mappings: Dict[str, str]) -> pd.DataFrame:
         """Filter out empty/invalid entries."""
-        dataset_id_column = column_mappings['dataset_id']
-        table_name_column = column_mappings['table_name']
-        key_columns_column = column_mappings['key_columns']
-        
-        # Filter out empty entries
-        valid_df = df[
-            df[dataset_id_column].notna() & 
-            df[table_name_column].notna() & 
-            df[key_columns_column].notna() &
-            (df[dataset_id_column].astype(str).str.strip() != '') &
-            (df[table_name_column].astype(str).str.strip() != '') &
-            (df[key_columns_column].astype(str).str.strip() != '')
+        required_columns = [
+            column_mappings['dataset_id'],
+            column_mappings['table_name'],
+            column_mappings['key_columns'],
         ]
         
+        # Strip the required columns once (nullable string dtype) and treat blanks as missing
+        stripped = {
+            col: df[col].astype('string').str.strip().replace('', pd.NA)
+            for col in required_columns
+        }
+        valid_df = df.assign(**stripped).dropna(subset=required_columns)
+        
+        # Model names and key column sets repeat across rows; store each distinct value once
+        valid_df = valid_df.astype({
+            column_mappings['table_name']: 'category',
+            column_mappings['key_columns']: 'category',
+        })
+        
         self.logger.info(f"📋 Found {len(valid_df)} valid entries for comparison (with Output ID, Model Name, and Key Columns)")
         
         return valid_df
     
     def _process_inventory_comparisons(self, valid_df: pd.DataFrame, column_mappings: Dict[str, str],
-                                     sampling_method: str, export_debug_tables: bool) -> Dict[str, Any]:
+                                     sampling_method: str, export_debug_tables: bool,
+                                     max_workers: Optional[int] = None) -> Dict[str, Any]:
         """Process inventory comparison entries."""
         successful_comparisons = []
         failed_comparisons = []
         errors = []
         
-        dataset_id_column = column_mappings['dataset_id']
-        table_name_column = column_mappings['table_name']
-        key_columns_column = column_mappings['key_columns']
+        # Pull the columns once (already stripped by _filter_valid_entries)
+        dataset_ids = valid_df[column_mappings['dataset_id']].to_numpy(dtype=object)
+        table_names = valid_df[column_mappings['table_name']]
+        key_columns_values = valid_df[column_mappings['key_columns']]
         
-        for index, row in valid_df.iterrows():
-            dataset_id = str(row[dataset_id_column]).strip()
-            table_name = str(row[table_name_column]).strip()
-            key_columns_str = str(row[key_columns_column]).strip()
-            
-            # Clean table name - remove .sql extension if present
-            if table_name and table_name.lower().endswith('.sql'):
-                table_name = table_name[:-4]  # Remove last 4 characters (.sql)
-            
-            # Parse key columns (comma-separated)
-            key_columns = [col.strip() for col in key_columns_str.split(',') if col.strip()]
+        # Clean each distinct table name once - remove .sql extension if present
+        clean_table_names = [
+            name[:-4] if name.lower().endswith('.sql') else name
+            for name in table_names.cat.categories
+        ]
+        
+        # Parse each distinct key columns value once (comma-separated)
+        parsed_key_columns = [
+            [col.strip() for col in value.split(',') if col.strip()]
+            for value in key_columns_values.cat.categories
+        ]
+        
+        # Parse entries first so only valid ones are dispatched
+        entries = []
+        for index, dataset_id, table_code, key_code in zip(
+            valid_df.index, dataset_ids,
+            table_names.cat.codes.to_numpy(), key_columns_values.cat.codes.to_numpy()
+        ):
+            key_columns = parsed_key_columns[key_code]
             
             if not key_columns:
-                self.logger.info(f"⏭️  Skipping row {index + 2}: Invalid Key Columns format")
+                self.logger.info("⏭️  Skipping row %d: Invalid Key Columns format", index + 2)
                 continue
             
-            self.logger.info(f"🔄 Comparing dataset {dataset_id} vs table {table_name}")
-            self.logger.info(f"🔑 Using key columns: {', '.join(key_columns)}")
+            entries.append((dataset_id, clean_table_names[table_code], list(key_columns)))
+        
+        # Rows of the same Domo dataset share its schema/row count: the first worker to
+        # need a value fetches it and workers needing it at the same time wait for it
+        domo_cache = DomoCache()
+        # Rows repeating the same comparison reuse the first report
+        report_cache = ReportCache()
+        early_exit_on_mismatch = (
+            get_env_config().get('COMPARISON_EARLY_EXIT', 'false').strip().lower() in TRUTHY_VALUES
+        )
+        
+        max_workers = min(get_compare_workers(max_workers), len(entries))
+        
+        if max_workers <= 1:
+            for entry in entries:
+                dataset_id, succeeded, entry_errors = self._compare_entry(
+                    self.comparator, *entry, sampling_method, export_debug_tables, domo_cache, report_cache,
+                    early_exit_on_mismatch
+                )
+                (successful_comparisons if succeeded else failed_comparisons).append(dataset_id)
+                errors.extend(entry_errors)
+        else:
+            self.logger.info(f"⚡ Running {len(entries)} comparisons with {max_workers} workers")
+            workers = WorkerComparators(
+                type(self.comparator), shared_comparator=self.comparator, connection_key=get_connection_key()
+            )
             
-            try:
-                # Generate comparison report
-                report = self.comparator.generate_report(
-                    domo_dataset_id=dataset_id,
-                    snowflake_table=table_name,
-                    key_columns=key_columns,
-                    sample_size=None,  # Use auto-calculation
-                    transform_names=False,  # Don't transform by default for inventory
-                    sampling_method=sampling_method,
-                    use_session_logging=False,  # Session logging handled by runner
-                    export_debug_tables=export_debug_tables
+            def run_entry(entry):
+                try:
+                    comparator = workers.get()
+                except Exception as e:
+                    self.logger.error("❌ Dataset %s: %s", entry[0], e)
+                    return entry[0], False, [f"Dataset {entry[0]}: {e}"]
+                return self._compare_entry(
+                    comparator, *entry, sampling_method, export_debug_tables, domo_cache, report_cache,
+                    early_exit_on_mismatch
                 )
-                
-                # Check if comparison was successful
-                if report.get('errors'):
-                    error_msg = f"Dataset {dataset_id}: Comparison failed with errors"
-                    self.logger.error(f"❌ {error_msg}")
-                    errors.extend([f"Dataset {dataset_id}: {err['error']}" for err in report['errors']])
-                    failed_comparisons.append(dataset_id)
-                else:
-                    success_msg = f"Dataset {dataset_id}: Comparison completed"
-                    if report.get('overall_match'):
-                        self.logger.info(f"✅ {success_msg} - Perfect match!")
-                    else:
-                        self.logger.warning(f"⚠️  {success_msg} - Discrepancies found")
-                    successful_comparisons.append(dataset_id)
-                
-            except Exception as e:
-                error_msg = f"Dataset {dataset_id}: {str(e)}"
-                self.logger.error(f"❌ {error_msg}")
-                errors.append(error_msg)
-                failed_comparisons.append(dataset_id)
+            
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inventory-compare") as executor:
+                    for _, result in iter_completed(executor, run_entry, entries, max_workers * 2):
+                        dataset_id, succeeded, entry_errors = result
+                        (successful_comparisons if succeeded else failed_comparisons).append(dataset_id)
+                        errors.extend(entry_errors)
+            finally:
+                workers.close()
         
         # Return results
         total_comparisons = len(successful_comparisons) + len(failed_comparisons)
@@ -284,6 +403,58 @@ class InventoryComparisonRunner:
             "failed_datasets": failed_comparisons
         }
     
+    def _compare_entry(self, comparator, dataset_id: str, table_name: str, key_columns: List[str],
+                       sampling_method: str, export_debug_tables: bool,
+                       domo_cache: Optional[DomoCache] = None,
+                       report_cache: Optional[ReportCache] = None,
+                       early_exit_on_mismatch: bool = False) -> tuple:
+        """
+        Run a single inventory comparison.
+        
+        Args:
+            domo_cache: Domo metadata cache shared by the comparisons of this run
+            report_cache: Report cache shared by the comparisons of this run
+            early_exit_on_mismatch: Skip the data comparison when schema or row count mismatch
+        
+        Returns:
+            Tuple of (dataset_id, succeeded, errors)
+        """
+        # Lazy %-style arguments: per-row messages are only formatted when emitted
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("🔄 Comparing dataset %s vs table %s", dataset_id, table_name)
+            self.logger.info("🔑 Using key columns: %s", ', '.join(key_columns))
+        
+        try:
+            # Generate comparison report
+            report = comparator.generate_report(
+                domo_dataset_id=dataset_id,
+                snowflake_table=table_name,
+                key_columns=key_columns,
+                sample_size=None,  # Use auto-calculation
+                transform_names=False,  # Don't transform by default for inventory
+                sampling_method=sampling_method,
+                use_session_logging=False,  # Session logging handled by runner
+                export_debug_tables=export_debug_tables,
+                domo_cache=domo_cache,
+                report_cache=report_cache,
+                early_exit_on_mismatch=early_exit_on_mismatch
+            )
+            
+            # Check if comparison was successful
+            if report.get('errors'):
+                self.logger.error("❌ Dataset %s: Comparison failed with errors", dataset_id)
+                return dataset_id, False, [f"Dataset {dataset_id}: {err['error']}" for err in report['errors']]
+            
+            if report.get('overall_match'):
+                self.logger.info("✅ Dataset %s: Comparison completed - Perfect match!", dataset_id)
+            else:
+                self.logger.warning("⚠️  Dataset %s: Comparison completed - Discrepancies found", dataset_id)
+            return dataset_id, True, []
+            
+        except Exception as e:
+            self.logger.error("❌ Dataset %s: %s", dataset_id, e)
+            return dataset_id, False, [f"Dataset {dataset_id}: {str(e)}"]
+    
     def _log_summary(self, results: Dict[str, Any]):
         """Log comparison summary."""
         total_comparisons = results['total']
@@ -291,19 +462,24 @@ class InventoryComparisonRunner:
         failed_comparisons = results['failed']
         errors = results['errors']
         
-        self.logger.info("="*80)
-        self.logger.info("📊 INVENTORY COMPARISON SUMMARY")
-        self.logger.info("="*80)
-        self.logger.info(f"✅ Successful comparisons: {successful_comparisons}")
-        self.logger.info(f"❌ Failed comparisons: {failed_comparisons}")
-        self.logger.info(f"📋 Total comparisons: {total_comparisons}")
+        # Emit the summary (and the error list) as single multi-line records
+        summary_lines = [
+            "="*80,
+            "📊 INVENTORY COMPARISON SUMMARY",
+            "="*80,
+            f"✅ Successful comparisons: {successful_comparisons}",
+            f"❌ Failed comparisons: {failed_comparisons}",
+            f"📋 Total comparisons: {total_comparisons}",
+        ]
         
         if successful_comparisons:
-            self.logger.info(f"📈 Success rate: {successful_comparisons/total_comparisons*100:.1f}%")
+            summary_lines.append(f"📈 Success rate: {successful_comparisons/total_comparisons*100:.1f}%")
+        
+        self.logger.info("\n".join(summary_lines))
         
         if errors:
-            self.logger.error("\n❌ Errors encountered:")
-            for error in errors[:10]:  # Show first 10 errors
-                self.logger.error(f"   • {error}")
+            error_lines = ["\n❌ Errors encountered:"]
+            error_lines.extend(f"   • {error}" for error in errors[:10])  # Show first 10 errors
             if len(errors) > 10:
-                self.logger.error(f"   ... and {len(errors) - 10} more errors")
+                error_lines.append(f"   ... and {len(errors) - 10} more errors")
+            self.logger.error("\n".join(error_lines))
@@ -6,13 +6,44 @@ based on configurations stored in Google Sheets.
 """
 
 import os
+import time
 import logging
-from typing import Dict, Any, Optional
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 import pandas as pd
 
-from ....utils.common import get_env_config
-from ....utils.gsheets import GoogleSheets, READ_WRITE_SCOPES
+from ....utils.common import TRUTHY_VALUES, get_env_config
 from ....utils.file_logger import start_logging_session, end_logging_session
+from ..reporting.executive_summary import ExecutiveSummaryGenerator, SUMMARY_TIMESTAMP_FORMAT
+from ..report_cache import ReportCache
+from ..dataset_comparator import get_connection_key
+from .worker_pool import WorkerComparators, get_compare_workers, iter_completed
+
+# The Google Sheets client is imported when a run actually needs it
+if TYPE_CHECKING:
+    from ....utils.gsheets import GoogleSheets
+
+# Accepted header names (normalized: stripped + lowercase), in priority order
+_COLUMN_ALIASES = {
+    'dataset_id': ('output id', 'output_id', 'dataset id', 'dataset_id', 'domo dataset id', 'domo_dataset_id', 'id'),
+    'table_name': ('model name', 'model_name'),
+    'key_columns': ('key columns', 'key_columns', 'keys', 'join columns', 'join_columns'),
+    'sample_size': ('sample size', 'sample_size', 'sample'),
+    'transform_columns': ('transform columns', 'transform_columns', 'transform'),
+    'status': ('status', 'comparison_status', 'comparison status', 'state'),
+    'notes': ('notes', 'note', 'comments'),
+}
+_REQUIRED_COLUMNS = ('dataset_id', 'table_name', 'key_columns')
+
+# Status written back per row when COMPARISON_STATUS_WRITEBACK is enabled
+STATUS_DONE = "Done"
+STATUS_FAILED = "Failed"
+
+# Parsed sheet configs are reused for this long (retries and repeated runs in one process)
+SHEET_CONFIG_TTL_SECONDS = 60
+# (spreadsheet_id, sheet_name) -> (monotonic timestamp, df, column_mappings, column_letters)
+_sheet_config_cache: Dict[tuple, tuple] = {}
 
 
 class SpreadsheetComparisonRunner:
@@ -27,10 +58,15 @@ class SpreadsheetComparisonRunner:
         """
         self.comparator = comparator
         self.logger = logging.getLogger("SpreadsheetRunner")
+        self.summary_generator = ExecutiveSummaryGenerator()
+        # Cell updates (notes, status) queued during a run, written in one batchUpdate
+        self._pending_updates = []
+        # Sheet column letter of each mapped header (set by _read_spreadsheet_config)
+        self._column_letters = {}
     
     def run_comparisons(self, spreadsheet_id: str, sheet_name: str = None,
                        credentials_path: str = None, sampling_method: str = "random", 
-                       export_debug_tables: bool = False) -> Dict[str, Any]:
+                       export_debug_tables: bool = False, max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Compare multiple datasets from Google Sheets configuration.
         
@@ -40,14 +76,19 @@ class SpreadsheetComparisonRunner:
         - Key Columns: Comma-separated list of key columns
         - Sample Size: (Optional) Number of rows to sample
         - Transform Columns: (Optional) True/False for column transformation
-        - Status: (Optional) Track comparison status
+        - Status: (Optional) Track comparison status (set to Done/Failed when
+          COMPARISON_STATUS_WRITEBACK is enabled)
+        
+        When COMPARISON_EARLY_EXIT is enabled, rows whose schema or row count already
+        mismatch skip the data comparison.
         
         Args:
             spreadsheet_id: Google Sheets spreadsheet ID
             sheet_name: Sheet name containing comparison configurations (uses COMPARISON_SHEET_NAME env var if None)
             credentials_path: Path to Google Sheets credentials file
             sampling_method: Sampling method ('random' or 'ordered')
-            export_debug_tables: If True, export the comparison tables as CSV files to results/debug/ for debugging
+            export_debug_tables: If True, export the comparison tables (Parquet by default, see DEBUG_EXPORT_FORMAT) to results/debug/ for debugging
+            max_workers: Number of concurrent comparisons (uses ARGO_COMPARE_WORKERS if None)
             
         Returns:
             Dictionary with comparison results summary
@@ -90,7 +131,7 @@ class SpreadsheetComparisonRunner:
             # Process comparisons
             results = self._process_comparisons(
                 testing_df, column_mappings, sampling_method, export_debug_tables, 
-                gsheets_client, spreadsheet_id, sheet_name
+                gsheets_client, spreadsheet_id, sheet_name, max_workers
             )
             
             # Log summary
@@ -110,8 +151,10 @@ class SpreadsheetComparisonRunner:
             # End logging session
             end_logging_session()
     
-    def _setup_gsheets_client(self, credentials_path: str = None) -> GoogleSheets:
+    def _setup_gsheets_client(self, credentials_path: str = None) -> "GoogleSheets":
         """Setup Google Sheets client."""
+        from ....utils.gsheets import get_gsheets_client, READ_WRITE_SCOPES
+        
         if not credentials_path:
             credentials_path = os.getenv("GOOGLE_SHEETS_CREDENTIALS_FILE")
         
@@ -121,104 +164,103 @@ class SpreadsheetComparisonRunner:
         if not os.path.exists(credentials_path):
             raise Exception(f"Google Sheets credentials file not found: {credentials_path}")
         
-        # Initialize Google Sheets client
-        return GoogleSheets(
+        # Reuse the process-wide Google Sheets client for these credentials
+        return get_gsheets_client(
             credentials_path=credentials_path,
             scopes=READ_WRITE_SCOPES
         )
     
-    def _read_spreadsheet_config(self, gsheets_client: GoogleSheets, 
+    def _read_spreadsheet_config(self, gsheets_client: "GoogleSheets", 
                                spreadsheet_id: str, sheet_name: str) -> tuple:
-        """Read and parse spreadsheet configuration."""
+        """
+        Read and parse spreadsheet configuration.
+        
+        Reads the header row first, then fetches only the mapped columns in one
+        batchGet request. Sheet column letters of the mapped headers are kept in
+        self._column_letters for writing results back.
+        
+        The parsed config is reused for SHEET_CONFIG_TTL_SECONDS, and dropped as
+        soon as results are written back to the spreadsheet.
+        """
+        cache_key = (spreadsheet_id, sheet_name)
+        cached = _sheet_config_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < SHEET_CONFIG_TTL_SECONDS:
+            _, df, column_mappings, column_letters = cached
+            self._column_letters = dict(column_letters)
+            self.logger.info(f"📊 Reusing {len(df)} comparison configurations read from {sheet_name}")
+            return df.copy(), dict(column_mappings)
+        
+        df, column_mappings = self._fetch_spreadsheet_config(gsheets_client, spreadsheet_id, sheet_name)
+        _sheet_config_cache[cache_key] = (
+            time.monotonic(), df.copy(), dict(column_mappings), dict(self._column_letters)
+        )
+        return df, column_mappings
+    
+    def _fetch_spreadsheet_config(self, gsheets_client: "GoogleSheets",
+                                  spreadsheet_id: str, sheet_name: str) -> tuple:
+        """Read the mapped columns from the sheet and build the config DataFrame."""
+        from ....utils.gsheets import column_letter
+        
         # Read comparison configurations
         self.logger.info(f"📖 Reading comparison configurations from {sheet_name}...")
-        data = gsheets_client.read_range(spreadsheet_id, f"{sheet_name}!A:Z")
+        header_rows = gsheets_client.read_range(spreadsheet_id, f"{sheet_name}!1:1")
         
-        if not data or len(data) < 2:
+        if not header_rows or not header_rows[0]:
             raise Exception(f"No data found in sheet '{sheet_name}' or missing headers")
         
-        # Convert to DataFrame
-        headers = data[0]
-        rows = data[1:]
+        # Find column mappings
+        all_headers = header_rows[0]
+        column_mappings = self._find_column_mappings(all_headers)
         
-        # Normalize row lengths to match header length
-        num_cols = len(headers)
-        normalized_rows = []
-        for row in rows:
-            # Ensure each row has the same number of columns as headers
-            normalized_row = row + [''] * (num_cols - len(row)) if len(row) < num_cols else row[:num_cols]
-            normalized_rows.append(normalized_row)
+        headers = list(dict.fromkeys(column_mappings.values()))
+        self._column_letters = {header: column_letter(all_headers.index(header)) for header in headers}
         
-        df = pd.DataFrame(normalized_rows, columns=headers)
+        value_ranges = gsheets_client.read_ranges(
+            spreadsheet_id,
+            [f"{sheet_name}!{self._column_letters[header]}2:{self._column_letters[header]}" for header in headers],
+            major_dimension="COLUMNS"
+        )
+        if len(value_ranges) != len(headers):
+            raise Exception(f"Could not read comparison columns from sheet '{sheet_name}'")
         
-        # Remove empty rows
-        df = df.dropna(how='all')
+        # Each single-column range comes back as [[v1, v2, ...]], or [] when blank
+        columns = [values[0] if values else [] for values in value_ranges]
+        num_rows = max((len(column) for column in columns), default=0)
         
-        self.logger.info(f"📊 Found {len(df)} comparison configurations")
+        if num_rows == 0:
+            raise Exception(f"No data found in sheet '{sheet_name}' or missing headers")
         
-        # Find column mappings
-        column_mappings = self._find_column_mappings(df)
+        # Pad columns to the same length (the API omits trailing blank cells)
+        df = pd.DataFrame({
+            header: column + [''] * (num_rows - len(column))
+            for header, column in zip(headers, columns)
+        })
+        
+        # Remove empty rows (Sheets returns '' for empty cells, never NaN). The index is
+        # not reset, so index + 2 stays the sheet row used to write results back.
+        df = df[df.ne('').any(axis=1)]
+        
+        self.logger.info(f"📊 Found {len(df)} comparison configurations")
         
         return df, column_mappings
     
-    def _find_column_mappings(self, df: pd.DataFrame) -> Dict[str, str]:
-        """Find the column mappings in the spreadsheet."""
-        column_mappings = {}
+    def _find_column_mappings(self, headers: List[str]) -> Dict[str, str]:
+        """Find the column mappings in the spreadsheet headers."""
+        # Normalized header -> actual header (first occurrence wins)
+        normalized_columns = {}
+        for col in headers:
+            normalized_columns.setdefault(str(col).strip().lower(), col)
         
-        # Find Output ID column
-        possible_dataset_id_columns = ['Output ID', 'output_id', 'Dataset ID', 'dataset_id', 'Domo Dataset ID', 'domo_dataset_id', 'ID', 'id']
-        for col in possible_dataset_id_columns:
-            if col in df.columns:
-                column_mappings['dataset_id'] = col
-                break
-        
-        # Find Table Name column (accept 'Model Name' as preferred)
-        possible_table_columns = ['Model Name', 'model_name']
-        for col in possible_table_columns:
-            if col in df.columns:
-                column_mappings['table_name'] = col
-                break
-        
-        # Find Key Columns column
-        possible_key_columns = ['Key Columns', 'key_columns', 'Keys', 'keys', 'Join Columns', 'join_columns']
-        for col in possible_key_columns:
-            if col in df.columns:
-                column_mappings['key_columns'] = col
-                break
-        
-        # Find Sample Size column (optional)
-        possible_sample_columns = ['Sample Size', 'sample_size', 'Sample', 'sample']
-        for col in possible_sample_columns:
-            if col in df.columns:
-                column_mappings['sample_size'] = col
-                break
-        
-        # Find Transform Columns column (optional)
-        possible_transform_columns = ['Transform Columns', 'transform_columns', 'Transform', 'transform']
-        for col in possible_transform_columns:
-            if col in df.columns:
-                column_mappings['transform_columns'] = col
-                break
-        
-        # Find Status column (optional)
-        possible_status_columns = ['Status', 'status', 'comparison_status', 'Comparison Status', 'state']
-        for col in possible_status_columns:
-            if col in df.columns:
-                column_mappings['status'] = col
-                break
-        
-        # Find Notes column (optional)
-        possible_notes_columns = ['Notes', 'notes', 'Note', 'note', 'Comments', 'comments']
-        for col in possible_notes_columns:
-            if col in df.columns:
-                column_mappings['notes'] = col
-                break
+        column_mappings = {}
+        for mapping_key, aliases in _COLUMN_ALIASES.items():
+            match = next((normalized_columns[alias] for alias in aliases if alias in normalized_columns), None)
+            if match is not None:
+                column_mappings[mapping_key] = match
         
         # Validate required columns
-        required_columns = ['dataset_id', 'table_name', 'key_columns']
-        for req_col in required_columns:
-            if req_col not in column_mappings:
-                raise Exception(f"Required column '{req_col}' not found in spreadsheet")
+        missing_columns = [col for col in _REQUIRED_COLUMNS if col not in column_mappings]
+        if missing_columns:
+            raise Exception(f"Required column(s) {', '.join(repr(col) for col in missing_columns)} not found in spreadsheet")
         
         return column_mappings
     
@@ -228,9 +270,11 @@ class SpreadsheetComparisonRunner:
         
         # Filter rows where Status is "Testing" (if status column exists)
         if status_column and status_column in df.columns:
-            df[status_column] = df[status_column].fillna('Pending')
-            df[status_column] = df[status_column].astype(str)
-            testing_df = df[df[status_column].str.contains('Testing', case=False, na=False)]
+            # Exact (case-insensitive) match, so e.g. 'Testing-Paused' is not picked up.
+            # Cells are always strings ('' when empty), so no fillna/astype pass is needed,
+            # and the filter reads a derived Series instead of writing back into df.
+            is_testing = df[status_column].str.strip().str.lower().eq('testing')
+            testing_df = df[is_testing]
             self.logger.info(f"📋 Found {len(testing_df)} comparisons in 'Testing' status")
         else:
             testing_df = df
@@ -240,124 +284,240 @@ class SpreadsheetComparisonRunner:
     
     def _process_comparisons(self, testing_df: pd.DataFrame, column_mappings: Dict[str, str],
                            sampling_method: str, export_debug_tables: bool,
-                           gsheets_client: GoogleSheets, spreadsheet_id: str, sheet_name: str) -> Dict[str, Any]:
+                           gsheets_client: "GoogleSheets", spreadsheet_id: str, sheet_name: str,
+                           max_workers: Optional[int] = None) -> Dict[str, Any]:
         """Process all comparison entries."""
-        successful_comparisons = []
-        failed_comparisons = []
-        errors = []
+        self._pending_updates = []
+        try:
+            records = self._compare_rows(
+                testing_df, column_mappings, sampling_method, export_debug_tables, sheet_name, max_workers
+            )
+        finally:
+            # Write every queued cell update in a single request
+            self._flush_updates(gsheets_client, spreadsheet_id)
+        
+        # Aggregate the per-row records in one pass
+        successful_comparisons = [r['dataset_id'] for r in records if r['status'] == 'success']
+        failed_comparisons = [r['dataset_id'] for r in records if r['status'] == 'failed']
+        errors = [error for r in records for error in r['errors']]
+        total_comparisons = len(records)
         
+        return {
+            "success": len(successful_comparisons),
+            "failed": len(failed_comparisons),
+            "total": total_comparisons,
+            "errors": errors,
+            "successful_datasets": successful_comparisons,
+            "failed_datasets": failed_comparisons
+        }
+    
+    def _compare_rows(self, testing_df: pd.DataFrame, column_mappings: Dict[str, str],
+                      sampling_method: str, export_debug_tables: bool,
+                      sheet_name: str, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run the comparison for each valid row.
+        
+        Returns:
+            One record per compared row: {'dataset_id', 'status' ('success' or 'failed'), 'errors'}
+        """
+        records = []
         dataset_id_column = column_mappings['dataset_id']
         table_name_column = column_mappings['table_name']
         key_columns_column = column_mappings['key_columns']
         sample_size_column = column_mappings.get('sample_size')
         transform_columns_column = column_mappings.get('transform_columns')
         notes_column = column_mappings.get('notes')
+        env_config = get_env_config()
+        status_column = None
+        if env_config.get('COMPARISON_STATUS_WRITEBACK', 'false').strip().lower() in TRUTHY_VALUES:
+            status_column = column_mappings.get('status')
+        early_exit_on_mismatch = env_config.get('COMPARISON_EARLY_EXIT', 'false').strip().lower() in TRUTHY_VALUES
+        
+        # Validate and parse all rows with column-wise string operations
+        def cleaned(column: str) -> pd.Series:
+            return testing_df[column].fillna('').astype(str).str.strip()
+        
+        # Sheet row numbers (the index is the 0-based position below the header row)
+        sheet_rows = pd.Series(testing_df.index + 2, index=testing_df.index).astype(str)
+        
+        dataset_ids = cleaned(dataset_id_column)
+        # Clean table names - remove .sql extension if present
+        table_names = cleaned(table_name_column).str.replace(r'\.sql$', '', regex=True, case=False)
+        key_columns_values = cleaned(key_columns_column)
+        
+        # Skip incomplete rows instead of treating them as errors (first missing field wins)
+        has_id = dataset_ids.ne('')
+        has_table = table_names.ne('')
+        has_keys = key_columns_values.ne('')
+        valid = has_id & has_table & has_keys
+        
+        for mask, reason in ((~has_id, "Empty Output ID"),
+                             (has_id & ~has_table, "Empty Table Name"),
+                             (has_id & has_table & ~has_keys, "Empty Key Columns")):
+            if mask.any():
+                rows = ', '.join(sheet_rows[mask])
+                self.logger.info(f"⏭️  Skipping rows {rows}: {reason}")
+        
+        # Parse key columns (comma-separated)
+        key_columns_lists = key_columns_values[valid].str.split(',').map(
+            lambda parts: [col.strip() for col in parts if col.strip()]
+        )
         
-        for index, row in testing_df.iterrows():
-            dataset_id = row[dataset_id_column]
-            table_name = row[table_name_column]
-            key_columns_str = row[key_columns_column]
-            
-            # Clean table name - remove .sql extension if present
-            if table_name and str(table_name).strip().lower().endswith('.sql'):
-                table_name = str(table_name).strip()[:-4]  # Remove last 4 characters (.sql)
-            
-            # Validate required fields - skip incomplete rows instead of treating as errors
-            if pd.isna(dataset_id) or str(dataset_id).strip() == '':
-                self.logger.info(f"⏭️  Skipping row {index + 2}: Empty Output ID")
-                continue
-            
-            if pd.isna(table_name) or str(table_name).strip() == '':
-                self.logger.info(f"⏭️  Skipping row {index + 2}: Empty Table Name")
-                continue
-            
-            if pd.isna(key_columns_str) or str(key_columns_str).strip() == '':
-                self.logger.info(f"⏭️  Skipping row {index + 2}: Empty Key Columns")
-                continue
+        # Parse optional fields
+        sample_sizes = pd.Series(float('nan'), index=testing_df.index)
+        if sample_size_column:
+            raw_sample_sizes = cleaned(sample_size_column)
+            sample_sizes = pd.to_numeric(raw_sample_sizes, errors='coerce')
+            # Only finite, whole, positive numbers are sample sizes ("inf", "1000.5", "-5" are not)
+            usable = (sample_sizes > 0) & (sample_sizes < float('inf')) & (sample_sizes % 1 == 0)
+            sample_sizes = sample_sizes.where(usable)
+            invalid_sample_sizes = valid & raw_sample_sizes.ne('') & sample_sizes.isna()
+            if invalid_sample_sizes.any():
+                rows = ', '.join(sheet_rows[invalid_sample_sizes])
+                self.logger.warning(f"⚠️  Rows {rows}: Invalid sample size, using auto-calculation")
+        
+        transform_flags = pd.Series(False, index=testing_df.index)
+        if transform_columns_column:
+            transform_flags = cleaned(transform_columns_column).str.lower().isin(TRUTHY_VALUES)
+        
+        entries = list(zip(
+            testing_df.index[valid].tolist(),
+            dataset_ids[valid].tolist(),
+            table_names[valid].tolist(),
+            key_columns_lists.tolist(),
+            [None if pd.isna(size) else int(size) for size in sample_sizes[valid]],
+            transform_flags[valid].tolist()
+        ))
+        
+        # Existing notes and A1 cell ranges as plain values so the loop never touches the DataFrame
+        current_notes = cleaned(notes_column).to_dict() if notes_column else {}
+        
+        def cell_ranges(column: Optional[str]) -> Dict[int, str]:
+            if not column:
+                return {}
+            return (f"{sheet_name}!{self._column_letters[column]}" + sheet_rows).to_dict()
+        
+        notes_ranges = cell_ranges(notes_column)
+        status_ranges = cell_ranges(status_column)
+        # Every note written by this run carries the run's start time
+        summary_timestamp = datetime.now().strftime(SUMMARY_TIMESTAMP_FORMAT)
+        
+        def record(entry, report, entry_errors):
+            index, dataset_id, table_name = entry[:3]
+            records.append({
+                'dataset_id': dataset_id,
+                'status': 'failed' if entry_errors else 'success',
+                'errors': entry_errors,
+            })
             
-            # Parse key columns (comma-separated)
-            key_columns = [col.strip() for col in str(key_columns_str).split(',') if col.strip()]
+            if status_column:
+                self._queue_cell_update(status_ranges[index], STATUS_FAILED if entry_errors else STATUS_DONE)
             
-            # Parse optional fields
-            sample_size = None
-            if sample_size_column and not pd.isna(row.get(sample_size_column)):
-                try:
-                    sample_size = int(row[sample_size_column])
-                except (ValueError, TypeError):
-                    self.logger.warning(f"⚠️  Row {index + 2}: Invalid sample size, using auto-calculation")
-            
-            transform_columns = False
-            if transform_columns_column and not pd.isna(row.get(transform_columns_column)):
-                transform_value = str(row[transform_columns_column]).lower()
-                transform_columns = transform_value in ['true', '1', 'yes', 'y', 'enabled']
-            
-            self.logger.info(f"🔄 Comparing dataset {dataset_id} vs table {table_name}")
-            
-            try:
-                # Generate comparison report
-                report = self.comparator.generate_report(
-                    domo_dataset_id=str(dataset_id),
-                    snowflake_table=str(table_name),
-                    key_columns=key_columns,
-                    sample_size=sample_size,
-                    transform_names=transform_columns,
-                    sampling_method=sampling_method,
-                    use_session_logging=False,  # Session logging handled by runner
-                    export_debug_tables=export_debug_tables
+            # Always update notes in spreadsheet if notes column exists
+            if notes_column and report is not None:
+                self._update_spreadsheet_notes(
+                    notes_ranges[index], current_notes.get(index, ''), dataset_id, table_name, report,
+                    summary_timestamp
                 )
-                
-                # Check if comparison was successful
-                if report.get('errors'):
-                    error_msg = f"Dataset {dataset_id}: Comparison failed with errors"
-                    self.logger.error(f"❌ {error_msg}")
-                    errors.extend([f"Dataset {dataset_id}: {err['error']}" for err in report['errors']])
-                    failed_comparisons.append(str(dataset_id))
-                else:
-                    success_msg = f"Dataset {dataset_id}: Comparison completed"
-                    if report.get('overall_match'):
-                        self.logger.info(f"✅ {success_msg} - Perfect match!")
-                    else:
-                        self.logger.warning(f"⚠️  {success_msg} - Discrepancies found")
-                    successful_comparisons.append(str(dataset_id))
-                
-                # Always update notes in spreadsheet if notes column exists
-                if notes_column:
-                    self._update_spreadsheet_notes(
-                        gsheets_client, spreadsheet_id, sheet_name, index, 
-                        notes_column, testing_df, dataset_id, table_name, report
-                    )
-                
+        
+        # Rows repeating the same comparison reuse the first report
+        report_cache = ReportCache()
+        max_workers = min(get_compare_workers(max_workers), len(entries))
+        
+        if max_workers <= 1:
+            for entry in entries:
+                record(entry, *self._run_single_comparison(
+                    self.comparator, entry, sampling_method, export_debug_tables, report_cache,
+                    early_exit_on_mismatch
+                ))
+            return records
+        
+        # Each worker thread gets its own connected comparator (connections are not thread-safe)
+        self.logger.info(f"⚡ Running {len(entries)} comparisons with {max_workers} workers")
+        workers = WorkerComparators(
+            type(self.comparator), shared_comparator=self.comparator, connection_key=get_connection_key()
+        )
+        
+        def run_entry(entry):
+            try:
+                comparator = workers.get()
             except Exception as e:
-                error_msg = f"Dataset {dataset_id}: {str(e)}"
-                self.logger.error(f"❌ {error_msg}")
-                errors.append(error_msg)
-                failed_comparisons.append(str(dataset_id))
+                self.logger.error(f"❌ Dataset {entry[1]}: {e}")
+                return None, [f"Dataset {entry[1]}: {e}"]
+            return self._run_single_comparison(
+                comparator, entry, sampling_method, export_debug_tables, report_cache,
+                early_exit_on_mismatch
+            )
         
-        # Return results
-        total_comparisons = len(successful_comparisons) + len(failed_comparisons)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spreadsheet-compare") as executor:
+                for entry, result in iter_completed(executor, run_entry, entries, max_workers * 2):
+                    record(entry, *result)
+        finally:
+            workers.close()
         
-        return {
-            "success": len(successful_comparisons),
-            "failed": len(failed_comparisons),
-            "total": total_comparisons,
-            "errors": errors,
-            "successful_datasets": successful_comparisons,
-            "failed_datasets": failed_comparisons
-        }
+        return records
     
-    def _update_spreadsheet_notes(self, gsheets_client: GoogleSheets, spreadsheet_id: str,
-                                sheet_name: str, index: int, notes_column: str, 
-                                testing_df: pd.DataFrame, dataset_id: str, table_name: str,
-                                report: Dict[str, Any]):
-        """Update notes in the spreadsheet."""
+    def _run_single_comparison(self, comparator, entry: tuple, sampling_method: str,
+                               export_debug_tables: bool,
+                               report_cache: Optional[ReportCache] = None,
+                               early_exit_on_mismatch: bool = False) -> tuple:
+        """
+        Run the comparison for one parsed spreadsheet row.
+        
+        Args:
+            report_cache: Report cache shared by the comparisons of this run
+            early_exit_on_mismatch: Skip the data comparison when schema or row count mismatch
+        
+        Returns:
+            Tuple of (report or None if the comparison raised, list of error messages)
+        """
+        _, dataset_id, table_name, key_columns, sample_size, transform_columns = entry
+        
+        self.logger.info(f"🔄 Comparing dataset {dataset_id} vs table {table_name}")
+        
         try:
-            from ..reporting.executive_summary import ExecutiveSummaryGenerator
-            summary_generator = ExecutiveSummaryGenerator()
+            # Generate comparison report
+            report = comparator.generate_report(
+                domo_dataset_id=dataset_id,
+                snowflake_table=table_name,
+                key_columns=key_columns,
+                sample_size=sample_size,
+                transform_names=transform_columns,
+                sampling_method=sampling_method,
+                use_session_logging=False,  # Session logging handled by runner
+                export_debug_tables=export_debug_tables,
+                report_cache=report_cache,
+                early_exit_on_mismatch=early_exit_on_mismatch
+            )
+            
+            # Check if comparison was successful
+            if report.get('errors'):
+                error_msg = f"Dataset {dataset_id}: Comparison failed with errors"
+                self.logger.error(f"❌ {error_msg}")
+                return report, [f"Dataset {dataset_id}: {err['error']}" for err in report['errors']]
+            
+            success_msg = f"Dataset {dataset_id}: Comparison completed"
+            if report.get('overall_match'):
+                self.logger.info(f"✅ {success_msg} - Perfect match!")
+            else:
+                self.logger.warning(f"⚠️  {success_msg} - Discrepancies found")
+            return report, []
             
+        except Exception as e:
+            error_msg = f"Dataset {dataset_id}: {str(e)}"
+            self.logger.error(f"❌ {error_msg}")
+            return None, [error_msg]
+    
+    def _update_spreadsheet_notes(self, notes_cell_range: str, current_notes: str,
+                                dataset_id: str, table_name: str, report: Dict[str, Any],
+                                timestamp: Optional[str] = None):
+        """Queue the notes update for a row (written by _flush_updates)."""
+        try:
+            timestamp = timestamp or datetime.now().strftime(SUMMARY_TIMESTAMP_FORMAT)
             # Generate executive summary or error summary based on comparison result
             if report.get('errors'):
                 # Generate error summary for failed comparisons
-                timestamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
                 error_summary = f"❌ COMPARISON FAILED [{timestamp}]\n"
                 error_summary += f"Dataset: {dataset_id} → {table_name}\n"
                 error_summary += f"❌ Errors encountered:\n"
@@ -368,14 +528,7 @@ class SpreadsheetComparisonRunner:
             else:
                 # Generate normal executive summary for successful comparisons
                 comparison_obj = report.get('data_comparison', {}).get('comparison_object')
-                executive_summary = summary_generator.generate_executive_summary(report, comparison_obj)
-            
-            # Get current notes content
-            notes_cell_range = f"{sheet_name}!{chr(65 + testing_df.columns.get_loc(notes_column))}{index + 2}"
-            current_notes_result = gsheets_client.read_range(spreadsheet_id, notes_cell_range)
-            current_notes = ""
-            if current_notes_result and len(current_notes_result) > 0 and len(current_notes_result[0]) > 0:
-                current_notes = str(current_notes_result[0][0]).strip()
+                executive_summary = self.summary_generator.generate_executive_summary(report, comparison_obj, timestamp)
             
             # Append executive summary to existing notes
             if current_notes:
@@ -383,12 +536,30 @@ class SpreadsheetComparisonRunner:
             else:
                 updated_notes = executive_summary
             
-            # Update the notes cell
-            gsheets_client.write_range(spreadsheet_id, notes_cell_range, [[updated_notes]])
-            self.logger.info(f"📝 Updated notes for dataset {dataset_id}")
+            self._queue_cell_update(notes_cell_range, updated_notes)
             
         except Exception as e:
-            self.logger.warning(f"⚠️  Could not update notes for row {index + 2}: {e}")
+            self.logger.warning(f"⚠️  Could not update notes cell {notes_cell_range}: {e}")
+    
+    def _queue_cell_update(self, cell_range: str, value: str):
+        """Queue a single cell write (A1 range) for the next _flush_updates."""
+        self._pending_updates.append({"range": cell_range, "values": [[value]]})
+    
+    def _flush_updates(self, gsheets_client: "GoogleSheets", spreadsheet_id: str):
+        """Write all queued cell updates with a single values.batchUpdate call."""
+        updates, self._pending_updates = self._pending_updates, []
+        if not updates:
+            return
+        
+        # The cached sheet config no longer matches what is in the spreadsheet
+        for cache_key in [key for key in _sheet_config_cache if key[0] == spreadsheet_id]:
+            _sheet_config_cache.pop(cache_key, None)
+        
+        try:
+            gsheets_client.batch_update_values(spreadsheet_id, updates, value_input_option="RAW")
+            self.logger.info(f"📝 Updated {len(updates)} spreadsheet cells")
+        except Exception as e:
+            self.logger.warning(f"⚠️  Could not update spreadsheet: {e}")
     
     def _log_summary(self, results: Dict[str, Any]):
         """Log comparison summary."""
@@ -397,19 +568,24 @@ class SpreadsheetComparisonRunner:
         failed_comparisons = results['failed']
         errors = results['errors']
         
-        self.logger.info("="*80)
-        self.logger.info("📊 SPREADSHEET COMPARISON SUMMARY")
-        self.logger.info("="*80)
-        self.logger.info(f"✅ Successful comparisons: {successful_comparisons}")
-        self.logger.info(f"❌ Failed comparisons: {failed_comparisons}")
-        self.logger.info(f"📋 Total comparisons: {total_comparisons}")
+        # Emit the summary (and the error list) as single multi-line records
+        summary_lines = [
+            "="*80,
+            "📊 SPREADSHEET COMPARISON SUMMARY",
+            "="*80,
+            f"✅ Successful comparisons: {successful_comparisons}",
+            f"❌ Failed comparisons: {failed_comparisons}",
+            f"📋 Total comparisons: {total_comparisons}",
+        ]
         
         if successful_comparisons:
-            self.logger.info(f"📈 Success rate: {successful_comparisons/total_comparisons*100:.1f}%")
+            summary_lines.append(f"📈 Success rate: {successful_comparisons/total_comparisons*100:.1f}%")
+        
+        self.logger.info("\n".join(summary_lines))
         
         if errors:
-            self.logger.error("\n❌ Errors encountered:")
-            for error in errors[:10]:  # Show first 10 errors
-                self.logger.error(f"   • {error}")
+            error_lines = ["\n❌ Errors encountered:"]
+            error_lines.extend(f"   • {error}" for error in errors[:10])  # Show first 10 errors
             if len(errors) > 10:
-                self.logger.error(f"   ... and {len(errors) - 10} more errors")
+                error_lines.append(f"   ... and {len(errors) - 10} more errors")
+            self.logger.error("\n".join(error_lines))
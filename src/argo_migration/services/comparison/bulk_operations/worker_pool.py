@@ -0,0 +1,177 @@
+"""
+Worker helpers for running bulk comparisons concurrently.
+
+A DatasetComparator owns a single Snowflake connection and mutable error state,
+so concurrent comparisons each need their own instance. This module hands out
+one connected comparator per worker thread, reusing the runner's own connected
+comparator for the first worker. Extra worker comparators can stay connected
+after a run and be handed to the workers of a later run with the same
+connection settings, so repeated bulk runs do not authenticate again. Idle
+comparators are only reused while young and with a live Snowflake session;
+stale ones are closed and replaced by freshly connected comparators.
+"""
+
+import os
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Idle comparators older than this are closed instead of reused (Domo tokens and
+# Snowflake sessions may have expired while they sat idle)
+IDLE_COMPARATOR_MAX_AGE_SECONDS = 900
+
+# Connected worker comparators left by finished runs, keyed by connection settings
+_idle_comparators: Dict[tuple, List[Tuple[float, Any]]] = {}  # key -> [(monotonic time parked, comparator)]
+_idle_comparators_lock = threading.Lock()
+
+
+def get_compare_workers(max_workers: Optional[int] = None) -> int:
+    """
+    Number of concurrent comparisons for bulk runs.
+
+    Uses max_workers when given, otherwise ARGO_COMPARE_WORKERS (default: 1, i.e.
+    sequential). Each extra worker opens its own Domo/Snowflake connections.
+
+    Args:
+        max_workers: Explicit worker count (overrides the environment)
+    """
+    if max_workers is not None:
+        return max(1, int(max_workers))
+    try:
+        return max(1, int(os.getenv("ARGO_COMPARE_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def iter_completed(executor: Executor, fn: Callable, items: Iterable,
+                   max_pending: int) -> Iterator[Tuple[Any, Any]]:
+    """
+    Run fn over items with a bounded number of submitted tasks.
+
+    Only max_pending tasks are queued at a time, and each finished future is
+    dropped once yielded, so comparison reports are released as soon as the
+    caller has recorded them instead of being held until the whole run ends.
+
+    Args:
+        executor: Executor to submit work to
+        fn: Callable applied to each item
+        items: Items to process (consumed lazily)
+        max_pending: Maximum number of submitted, unfinished tasks
+
+    Returns:
+        Iterator of (item, result) pairs in completion order
+    """
+    items = iter(items)
+    pending = {executor.submit(fn, item): item for item in islice(items, max_pending)}
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = pending.pop(future)
+            # Refill before yielding so workers stay busy while the caller records
+            for next_item in islice(items, 1):
+                pending[executor.submit(fn, next_item)] = next_item
+            yield item, future.result()
+
+
+class WorkerComparators:
+    """Provide one connected comparator per worker thread."""
+
+    def __init__(self, comparator_factory: Callable, shared_comparator: Optional[object] = None,
+                 connection_key: Optional[tuple] = None):
+        """
+        Initialize worker comparators.
+
+        Args:
+            comparator_factory: Callable returning a new (unconnected) DatasetComparator
+            shared_comparator: Already-connected comparator handed to the first worker.
+                It stays owned by the caller and is not closed by close().
+            connection_key: Connection settings of this run (see get_connection_key). When
+                given, idle comparators left by earlier runs are reused and close() keeps
+                the worker comparators connected for later runs instead of closing them.
+        """
+        self.comparator_factory = comparator_factory
+        self._shared_comparator = shared_comparator
+        self._connection_key = connection_key
+        self.logger = logging.getLogger("WorkerComparators")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._comparators: List = []
+
+    def get(self):
+        """Get the comparator for the current thread, connecting it on first use."""
+        comparator = getattr(self._local, "comparator", None)
+        if comparator is None:
+            with self._lock:
+                comparator, self._shared_comparator = self._shared_comparator, None
+            if comparator is not None:
+                self._local.comparator = comparator
+                return comparator
+
+            comparator = self._take_idle()
+            if comparator is None:
+                comparator = self.comparator_factory()
+                if not comparator.setup_connections():
+                    raise Exception("Failed to setup connections for comparison worker")
+                self.logger.info(f"🔗 Worker {threading.current_thread().name} connected")
+            self._local.comparator = comparator
+            with self._lock:
+                self._comparators.append(comparator)
+        return comparator
+
+    def _take_idle(self):
+        """
+        Take a connected comparator left by an earlier run, if any.
+
+        Comparators idle for IDLE_COMPARATOR_MAX_AGE_SECONDS or longer, or whose
+        Snowflake connection no longer answers, are closed and skipped.
+        """
+        if self._connection_key is None:
+            return None
+        while True:
+            with _idle_comparators_lock:
+                idle = _idle_comparators.get(self._connection_key)
+                if not idle:
+                    return None
+                parked_at, comparator = idle.pop()
+            if (time.monotonic() - parked_at < IDLE_COMPARATOR_MAX_AGE_SECONDS
+                    and comparator.snowflake_handler.is_connected):
+                return comparator
+            self.logger.info("♻️  Discarding stale idle comparison worker")
+            _close_comparators([comparator])
+
+    def close(self):
+        """Release worker connections (file logging is shared and left open)."""
+        with self._lock:
+            comparators, self._comparators = self._comparators, []
+        if self._connection_key is not None:
+            parked_at = time.monotonic()
+            with _idle_comparators_lock:
+                _idle_comparators.setdefault(self._connection_key, []).extend(
+                    (parked_at, comparator) for comparator in comparators
+                )
+            return
+        _close_comparators(comparators)
+
+
+def _close_comparators(comparators: List):
+    """Close the Snowflake connections of comparators."""
+    for comparator in comparators:
+        try:
+            comparator.close_connections()
+        except Exception as e:
+            logging.getLogger("WorkerComparators").warning(f"⚠️  Could not close worker connection: {e}")
+
+
+def close_idle_comparators():
+    """Close the connections of worker comparators kept for later runs."""
+    with _idle_comparators_lock:
+        comparators = [comparator for idle in _idle_comparators.values() for _, comparator in idle]
+        _idle_comparators.clear()
+    _close_comparators(comparators)
+
+
+atexit.register(close_idle_comparators)
@@ -8,6 +8,7 @@ sampling coordination, column transformation, and datacompy integration.
 import os
 import re
 import logging
+from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import datacompy
@@ -15,29 +16,75 @@ import datacompy
 from .sampling.sampler import SmartSampler
 from .sampling.query_builder import escape_domo_column_list, normalize_snowflake_column_list
 from .reporting.debug_exporter import DebugExporter
+from .domo_cache import DomoCache, get_domo_row_count
 from ...utils.common import transform_column_name
 from ...api.domo import DomoHandler
 from ...api.snowflake import SnowflakeHandler
 
+# Arrow-backed strings need pyarrow (installed with the Snowflake pandas extras)
+try:
+    import pyarrow  # noqa: F401
+    ARROW_STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    ARROW_STRING_DTYPE = None
+
+# Characters not allowed in report file names
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# Intelligent mappings are applied automatically only at or above this confidence
+AUTO_MAPPING_MIN_CONFIDENCE = 0.8
+
+# Column Summary lines of the datacompy report that get the column names appended
+_MISSING_COLUMNS_LINE_RE = re.compile(r"^.*Number of columns in Domo but not in Snowflake:.*$", re.MULTILINE)
+_EXTRA_COLUMNS_LINE_RE = re.compile(r"^.*Number of columns in Snowflake but not in Domo:.*$", re.MULTILINE)
+
+
+def _append_after_lines(pattern: re.Pattern, text: str, extra_line: str) -> str:
+    """Insert extra_line after every line of text matched by pattern."""
+    return pattern.sub(lambda match: f"{match.group(0)}\n{extra_line}", text)
+
+
+def _lowercase_column_lookup(columns) -> Dict[str, str]:
+    """Map lowercased column names to actual names (first match wins, like a linear scan)."""
+    return {col.lower(): col for col in reversed(list(columns))}
+
 
 class DataComparator:
     """Compare data samples between Domo and Snowflake using datacompy."""
     
-    def __init__(self, domo_handler: DomoHandler, snowflake_handler: SnowflakeHandler):
+    def __init__(self, domo_handler: DomoHandler, snowflake_handler: SnowflakeHandler,
+                 errors: Optional[List[Dict[str, str]]] = None):
         """
         Initialize data comparator.
         
         Args:
             domo_handler: Initialized Domo handler
             snowflake_handler: Initialized Snowflake handler
+            errors: Error list to append to (a new one if None)
         """
         self.domo_handler = domo_handler
         self.snowflake_handler = snowflake_handler
         self.logger = logging.getLogger("DataComparator")
         self.sampler = SmartSampler(domo_handler, snowflake_handler)
         self.debug_exporter = DebugExporter()
-        self.errors = []
+        # Shared with the owning DatasetComparator when given, so reports need no merge
+        self.errors = errors if errors is not None else []
         self.session_timestamp = None
+        # Report directories already created by this comparator
+        self._created_dirs = set()
+        # Log the pre-comparison column dtypes at INFO (otherwise only at DEBUG)
+        self.debug_dump_dtypes = False
+        # Debug table exports still being written in the background
+        self._pending_exports = []
+    
+    def wait_for_exports(self):
+        """Block until background debug table exports have been written."""
+        pending, self._pending_exports = self._pending_exports, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                self.logger.error(f"❌ Failed to export debug tables: {e}")
     
     def set_session_timestamp(self, timestamp: str):
         """Set the session timestamp for this comparator."""
@@ -48,7 +95,7 @@ class DataComparator:
                            transform_names: bool = False, schema_comparison: Dict[str, Any] = None, 
                            sampling_method: str = "random", export_debug_tables: bool = False,
                            domo_column_mapping: dict = None, use_intelligent_mapping: bool = False,
-                           intelligent_mapping: dict = None) -> Dict[str, Any]:
+                           intelligent_mapping: dict = None, domo_cache: Optional[DomoCache] = None) -> Dict[str, Any]:
         """
         Compare data samples using datacompy.
         
@@ -60,10 +107,11 @@ class DataComparator:
             transform_names: Whether to apply column name transformation
             schema_comparison: Schema comparison results to include in report
             sampling_method: Sampling method ('random' for smart random with fallback, 'ordered' for direct ordered)
-            export_debug_tables: If True, export the comparison tables as CSV files to results/debug/ for debugging
+            export_debug_tables: If True, export the comparison tables (Parquet by default, see DEBUG_EXPORT_FORMAT) to results/debug/ for debugging
             domo_column_mapping: Mapping from normalized to original Domo column names
             use_intelligent_mapping: Whether to use intelligent column mapping
             intelligent_mapping: Intelligent column mapping dictionary
+            domo_cache: Optional per-run cache of Domo metadata keyed by dataset ID
             
         Returns:
             Dictionary with data comparison results
@@ -79,33 +127,18 @@ class DataComparator:
         domo_column_mapping = domo_column_mapping or {}
         
         # Map normalized key columns back to original Domo names for queries
-        domo_key_columns = []
-        self.logger.info(f"🔍 Debugging column mapping:")
-        self.logger.info(f"  Normalized key columns: {normalized_key_columns}")
-        self.logger.info(f"  Domo column mapping available: {bool(domo_column_mapping)}")
-        if domo_column_mapping:
-            self.logger.info(f"  _domo_original_columns keys: {list(domo_column_mapping.keys())}")
-            self.logger.info(f"  _domo_original_columns values: {list(domo_column_mapping.values())}")
-        
-        for normalized_key in normalized_key_columns:
-            self.logger.info(f"🔍 Looking for '{normalized_key}' in domo_column_mapping...")
-            self.logger.info(f"  Available keys: {list(domo_column_mapping.keys())}")
-            if normalized_key in domo_column_mapping:
-                domo_key_columns.append(domo_column_mapping[normalized_key])
-                self.logger.info(f"  ✅ '{normalized_key}' → '{domo_column_mapping[normalized_key]}'")
-            else:
-                # Fallback: assume the key column name is already in Domo format
-                domo_key_columns.append(normalized_key)
-                self.logger.info(f"  ⚠️ '{normalized_key}' → '{normalized_key}' (no mapping found)")
-        
-        self.logger.info(f"🔄 Key columns mapped back to Domo format: {normalized_key_columns} → {domo_key_columns}")
+        # (fallback: assume the key column name is already in Domo format)
+        domo_key_columns = [domo_column_mapping.get(key, key) for key in normalized_key_columns]
+        unmapped_keys = [key for key in normalized_key_columns if key not in domo_column_mapping]
+        self.logger.info(
+            f"🔄 Key columns mapped back to Domo format: {normalized_key_columns} → {domo_key_columns}"
+            + (f" (no mapping found for {unmapped_keys}, used as-is)" if unmapped_keys else "")
+        )
         
         # Get total count and calculate sample size if needed
         try:
             # Use DomoHandler for count query
-            domo_count_query = "SELECT COUNT(*) as row_count FROM table"
-            domo_result = self.domo_handler.query_dataset(domo_dataset_id, domo_count_query)
-            total_domo_rows = domo_result['rows'][0][0] if domo_result['rows'] else 0
+            total_domo_rows = get_domo_row_count(self.domo_handler, domo_dataset_id, domo_cache)
             
             if sample_size is None:
                 sample_size = self.sampler.calculate_sample_size(total_domo_rows)
@@ -153,135 +186,105 @@ class DataComparator:
                     self._add_error("Sample Extraction", "Both smart and fallback sampling failed", str(fallback_error))
                     return self._get_error_data_result(sample_size)
         
+        # Column names are resolved on plain lists (transform → key renames → intelligent
+        # mapping) and applied to each DataFrame once, just before the comparison
+        domo_columns = list(domo_df.columns)
+        sf_columns = list(sf_df.columns)
+        
         # Apply column transformation if enabled (applies to both sampling methods)
         if transform_names:
             self.logger.info("🔄 Applying full column name transformation...")
             
-            # Transform Domo columns
-            original_domo_columns = domo_df.columns.tolist()
-            transformed_domo_columns = [transform_column_name(col) for col in original_domo_columns]
-            domo_df.columns = transformed_domo_columns
-            
-            # Transform Snowflake columns (may have different case)
-            original_sf_columns = sf_df.columns.tolist()
-            transformed_sf_columns = [transform_column_name(col) for col in original_sf_columns]
-            sf_df.columns = transformed_sf_columns
-            
-            # Use normalized key columns (already transformed above)
-            key_columns_for_comparison = normalized_key_columns
+            # Transform Domo columns and Snowflake columns (may have different case)
+            domo_columns = [transform_column_name(col) for col in domo_columns]
+            sf_columns = [transform_column_name(col) for col in sf_columns]
             
             self.logger.info(f"🔄 Full column transformation applied to both DataFrames")
         else:
             # Even without full transformation, we need to use normalized key columns
-            key_columns_for_comparison = normalized_key_columns
             self.logger.info(f"🔄 Using normalized key columns without full column transformation")
-
-
-        self.logger.info("\n\n\n\n\n")
-        # Print data types for both tables before datacompy comparison
-        self.logger.info("🔍 DATA TYPES BEFORE DATACOMPY COMPARISON:")
-        self.logger.info(f"📊 DOMO TABLE ({domo_dataset_id}):")
-        for col in domo_df.columns:
-            dtype = str(domo_df[col].dtype)
-            self.logger.info(f"   {col}: {dtype}")
-        
-        self.logger.info(f"📊 SNOWFLAKE TABLE ({snowflake_table}):")
-        for col in sf_df.columns:
-            dtype = str(sf_df[col].dtype)
-            self.logger.info(f"   {col}: {dtype}")
-        
-        self.logger.info("🔍 END DATA TYPES")
-        self.logger.info("\n\n\n\n\n")
-
-
+        
+        # Use normalized key columns (already transformed above)
+        key_columns_for_comparison = normalized_key_columns
+        
         # Use datacompy for comparison
         try:
-            self.logger.info(f"📊 Domo DataFrame shape: {domo_df.shape}, columns: {list(domo_df.columns)}")
-            self.logger.info(f"📊 Snowflake DataFrame shape: {sf_df.shape}, columns: {list(sf_df.columns)}")
-            self.logger.info(f"📊 Key columns for comparison: {key_columns_for_comparison}")
+            self.logger.info(
+                f"📊 Domo DataFrame shape: {domo_df.shape}, Snowflake DataFrame shape: {sf_df.shape}, "
+                f"key columns: {key_columns_for_comparison}"
+            )
             
-            # Normalize data types for key columns to ensure compatibility
+            # Match key columns case-insensitively and rename them to the key names. datacompy
+            # lowercases all column names itself, but the key dtype alignment and the debug
+            # export look the key columns up by name in both frames before that happens
+            domo_lookup = _lowercase_column_lookup(domo_columns)
+            sf_lookup = _lowercase_column_lookup(sf_columns)
+            domo_renames = {}
+            sf_renames = {}
             for col in key_columns_for_comparison:
-                # Find matching columns case-insensitively
-                domo_col = None
-                sf_col = None
-                
-                # Find column in Domo DataFrame (case-insensitive)
-                for domo_column in domo_df.columns:
-                    if domo_column.lower() == col.lower():
-                        domo_col = domo_column
-                        break
+                domo_col = domo_lookup.get(col.lower())
+                sf_col = sf_lookup.get(col.lower())
                 
-                # Find column in Snowflake DataFrame (case-insensitive)
-                for sf_column in sf_df.columns:
-                    if sf_column.lower() == col.lower():
-                        sf_col = sf_column
-                        break
-                
-                if domo_col and sf_col:
-                    domo_dtype = str(domo_df[domo_col].dtype)
-                    sf_dtype = str(sf_df[sf_col].dtype)
-                    
-                    self.logger.info(f"Key column '{col}': Domo '{domo_col}'={domo_dtype}, Snowflake '{sf_col}'={sf_dtype}")
-                    
-                    # If types are different, convert both to string for compatibility
-                    if domo_dtype != sf_dtype:
-                        self.logger.info(f"Converting column '{col}' to string for compatibility")
-                        domo_df[domo_col] = domo_df[domo_col].astype(str)
-                        sf_df[sf_col] = sf_df[sf_col].astype(str)
-                    
-                    # Rename columns to match key_columns for datacompy compatibility
-                    if domo_col != col:
-                        domo_df = domo_df.rename(columns={domo_col: col})
-                        self.logger.info(f"Renamed Domo column '{domo_col}' to '{col}'")
-                    if sf_col != col:
-                        sf_df = sf_df.rename(columns={sf_col: col})
-                        self.logger.info(f"Renamed Snowflake column '{sf_col}' to '{col}'")
-                else:
+                if not (domo_col and sf_col):
                     # Handle column not found cases
-                    self._handle_missing_key_column(domo_df, sf_df, col, key_columns)
+                    domo_col, sf_col = self._find_original_key_columns(domo_lookup, sf_lookup, col, key_columns)
+                    if not (domo_col and sf_col):
+                        continue
+                
+                # Rename columns to match key_columns for datacompy compatibility
+                if domo_col != col:
+                    domo_renames[domo_col] = col
+                if sf_col != col:
+                    sf_renames[sf_col] = col
+            
+            if domo_renames:
+                self.logger.info("Renamed Domo key columns: %s", domo_renames)
+            if sf_renames:
+                self.logger.info("Renamed Snowflake key columns: %s", sf_renames)
+            domo_columns = [domo_renames.get(col, col) for col in domo_columns]
+            sf_columns = [sf_renames.get(col, col) for col in sf_columns]
             
             # Apply intelligent column mapping if enabled
             if use_intelligent_mapping and intelligent_mapping:
-                self.logger.info("🧠 Applying intelligent column mapping to DataFrames...")
-                self.logger.info(f"🧠 Intelligent mapping available: {len(intelligent_mapping)} mappings")
-                self.logger.info(f"🧠 Domo columns before mapping: {list(domo_df.columns)}")
-                self.logger.info(f"🧠 Snowflake columns before mapping: {list(sf_df.columns)}")
-                domo_df, sf_df = self._apply_intelligent_mapping(domo_df, sf_df, intelligent_mapping)
-                self.logger.info(f"🧠 Domo columns after mapping: {list(domo_df.columns)}")
-                self.logger.info(f"🧠 Snowflake columns after mapping: {list(sf_df.columns)}")
+                self.logger.info(f"🧠 Applying intelligent column mapping to DataFrames ({len(intelligent_mapping)} mappings)...")
+                domo_columns, sf_columns = self._apply_intelligent_mapping(domo_columns, sf_columns, intelligent_mapping)
+            elif not use_intelligent_mapping:
+                self.logger.info("🧠 Intelligent mapping not enabled")
             else:
-                self.logger.info("🧠 Intelligent mapping NOT enabled or not available")
-                if not use_intelligent_mapping:
-                    self.logger.info("🧠 use_intelligent_mapping = False")
-                if not intelligent_mapping:
-                    self.logger.info("🧠 intelligent_mapping = None or empty")
+                self.logger.info("🧠 Intelligent mapping not available (no mappings)")
+            
+            # Relabel each DataFrame once, in place (no data copy: the samples are owned here)
+            domo_df.columns = domo_columns
+            sf_df.columns = sf_columns
+            
+            # Key dtypes usually already match; only mismatched pairs need casting
+            present_keys = [col for col in key_columns_for_comparison if col in domo_df.columns and col in sf_df.columns]
+            mismatched_keys = [col for col in present_keys if domo_df[col].dtype != sf_df[col].dtype]
+            if not mismatched_keys:
+                self.logger.debug("Key column dtypes already match: %s", present_keys)
+            for col in mismatched_keys:
+                self.logger.info(f"Key column '{col}': Domo={domo_df[col].dtype}, Snowflake={sf_df[col].dtype}")
+                # Cast both to a common dtype for compatibility
+                domo_df[col], sf_df[col], common_dtype = self._align_key_dtypes(domo_df[col], sf_df[col])
+                self.logger.info(f"Converting column '{col}' to {common_dtype} for compatibility")
             
             # Debug: Export tables if requested
             if export_debug_tables:
-                self.debug_exporter.export_comparison_tables(
-                    domo_df, sf_df, domo_dataset_id, snowflake_table, key_columns_for_comparison
-                )
-            print("\n\n\n\n\n")
-            print("\n\n\n\n\n")
-            # Print data types for both tables before datacompy comparison
-            self.logger.info("🔍 DATA TYPES BEFORE DATACOMPY COMPARISON:")
-            self.logger.info(f"📊 DOMO TABLE ({domo_dataset_id}):")
-            for col in domo_df.columns:
-                dtype = str(domo_df[col].dtype)
-                self.logger.info(f"   {col}: {dtype}")
+                self._pending_exports.append(self.debug_exporter.export_comparison_tables(
+                    domo_df, sf_df, domo_dataset_id, snowflake_table, key_columns_for_comparison,
+                    timestamp=self.session_timestamp
+                ))
             
-            self.logger.info(f"📊 SNOWFLAKE TABLE ({snowflake_table}):")
-            for col in sf_df.columns:
-                dtype = str(sf_df[col].dtype)
-                self.logger.info(f"   {col}: {dtype}")
+            converted = self._convert_string_columns(domo_df, sf_df)
+            if converted:
+                self.logger.info(f"🏹 Using Arrow-backed strings for {converted} text columns")
             
-            self.logger.info("🔍 END DATA TYPES")
-            print("\n\n\n\n\n")
+            self._log_dtypes(domo_df, sf_df, domo_dataset_id, snowflake_table)
             comparison = datacompy.Compare(
                 domo_df,
                 sf_df,
                 join_columns=key_columns_for_comparison,
+                cast_column_names_lower=True,  # Domo and Snowflake disagree on case
                 df1_name='Domo',
                 df2_name='Snowflake'
             )
@@ -310,185 +313,230 @@ class DataComparator:
             self._add_error("Data Comparison", "Error using datacompy", str(e))
             return self._get_error_data_result(sample_size, len(domo_df), len(sf_df))
     
-    def _apply_intelligent_mapping(self, domo_df: pd.DataFrame, sf_df: pd.DataFrame, 
-                                 intelligent_mapping: dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def _log_dtypes(self, domo_df: pd.DataFrame, sf_df: pd.DataFrame,
+                    domo_dataset_id: str, snowflake_table: str):
+        """Log the column data types of both tables as one message (built only when it will be emitted)."""
+        level = logging.INFO if self.debug_dump_dtypes else logging.DEBUG
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        lines = ["🔍 DATA TYPES BEFORE DATACOMPY COMPARISON:", f"📊 DOMO TABLE ({domo_dataset_id}):"]
+        lines.extend(f"   {col}: {dtype}" for col, dtype in domo_df.dtypes.astype(str).items())
+        lines.append(f"📊 SNOWFLAKE TABLE ({snowflake_table}):")
+        lines.extend(f"   {col}: {dtype}" for col, dtype in sf_df.dtypes.astype(str).items())
+        lines.append("🔍 END DATA TYPES")
+        self.logger.log(level, "\n".join(lines))
+    
+    def _apply_intelligent_mapping(self, domo_columns: List[str], sf_columns: List[str],
+                                 intelligent_mapping: dict) -> Tuple[List[str], List[str]]:
         """
         Apply intelligent column mapping to align Domo and Snowflake column names.
         
+        Works on column name lists; the caller relabels the DataFrames once.
+        
         Args:
-            domo_df: Domo DataFrame
-            sf_df: Snowflake DataFrame
+            domo_columns: Domo column names
+            sf_columns: Snowflake column names
             intelligent_mapping: Intelligent column mapping dictionary
             
         Returns:
-            Tuple of (domo_df, sf_df) with aligned column names
+            Tuple of (domo_columns, sf_columns) with aligned column names
         """
         self.logger.info("🔄 Applying intelligent column mapping...")
-        self.logger.info(f"🔄 Intelligent mapping keys: {list(intelligent_mapping.keys())}")
-        
-        # Create mapping from Domo to Snowflake column names
-        domo_to_sf_mapping = {}
-        sf_to_domo_mapping = {}
-        
-        for domo_col, mapping_info in intelligent_mapping.items():
-            self.logger.info(f"🔄 Processing mapping for '{domo_col}': {mapping_info}")
-            if mapping_info.get('auto_apply', False) and mapping_info.get('confidence', 0) >= 0.8:
-                snowflake_col = mapping_info.get('snowflake_column')
-                if snowflake_col:
-                    domo_to_sf_mapping[domo_col] = snowflake_col
-                    sf_to_domo_mapping[snowflake_col] = domo_col
-                    self.logger.info(f"✅ AUTO '{domo_col}' → '{snowflake_col}' (confidence: {mapping_info.get('confidence', 0):.2f})")
-                else:
-                    self.logger.warning(f"⚠️ No snowflake_column found for '{domo_col}'")
-            else:
-                self.logger.info(f"⚠️ Skipping '{domo_col}' - auto_apply: {mapping_info.get('auto_apply', False)}, confidence: {mapping_info.get('confidence', 0)}")
         
-        self.logger.info(f"🔄 Final mappings - Domo to SF: {domo_to_sf_mapping}")
-        self.logger.info(f"🔄 Final mappings - SF to Domo: {sf_to_domo_mapping}")
+        # Create mapping from Domo to Snowflake column names (auto-applied, confident entries only)
+        approved = {
+            domo_col: mapping_info.get('snowflake_column')
+            for domo_col, mapping_info in intelligent_mapping.items()
+            if mapping_info.get('auto_apply') and mapping_info.get('confidence', 0) >= AUTO_MAPPING_MIN_CONFIDENCE
+        }
+        domo_to_sf_mapping = {domo_col: sf_col for domo_col, sf_col in approved.items() if sf_col}
+        sf_to_domo_mapping = {sf_col: domo_col for domo_col, sf_col in domo_to_sf_mapping.items()}
         
-        # Rename Domo columns to match Snowflake
-        domo_df_renamed = domo_df.copy()
-        for domo_col, sf_col in domo_to_sf_mapping.items():
-            if domo_col in domo_df_renamed.columns:
-                domo_df_renamed = domo_df_renamed.rename(columns={domo_col: sf_col})
-                self.logger.info(f"🔄 Renamed Domo column '{domo_col}' → '{sf_col}'")
-            else:
-                self.logger.warning(f"⚠️ Domo column '{domo_col}' not found in DataFrame")
-        
-        # Rename Snowflake columns to match Domo (for consistency)
-        sf_df_renamed = sf_df.copy()
-        for sf_col, domo_col in sf_to_domo_mapping.items():
-            if sf_col in sf_df_renamed.columns:
-                sf_df_renamed = sf_df_renamed.rename(columns={sf_col: domo_col})
-                self.logger.info(f"🔄 Renamed Snowflake column '{sf_col}' → '{domo_col}'")
-            else:
-                self.logger.warning(f"⚠️ Snowflake column '{sf_col}' not found in DataFrame")
+        for domo_col in approved.keys() - domo_to_sf_mapping.keys():
+            self.logger.warning(f"⚠️ No snowflake_column found for '{domo_col}'")
+        self.logger.debug("⚠️ Skipped %d mappings (not auto-applied or below confidence %.2f)",
+                          len(intelligent_mapping) - len(approved), AUTO_MAPPING_MIN_CONFIDENCE)
+        self.logger.debug("🔄 Final mappings - Domo to SF: %s, SF to Domo: %s", domo_to_sf_mapping, sf_to_domo_mapping)
+        
+        # Rename Domo columns to match Snowflake, and Snowflake columns to match Domo (for consistency)
+        domo_renames = self._present_renames(domo_columns, domo_to_sf_mapping, "Domo")
+        sf_renames = self._present_renames(sf_columns, sf_to_domo_mapping, "Snowflake")
+        self.logger.info("🔄 Renamed Domo columns: %s, Snowflake columns: %s", domo_renames, sf_renames)
         
         self.logger.info(f"📊 Intelligent mapping applied: {len(domo_to_sf_mapping)} columns mapped")
-        return domo_df_renamed, sf_df_renamed
+        return ([domo_renames.get(col, col) for col in domo_columns],
+                [sf_renames.get(col, col) for col in sf_columns])
     
-    def _handle_missing_key_column(self, domo_df: pd.DataFrame, sf_df: pd.DataFrame, 
-                                 col: str, key_columns: List[str]):
-        """Handle cases where key column is not found in DataFrames."""
-        # If column not found, try to find it with the original name (before normalization)
-        original_col_name = None
-        for original_key in key_columns:
-            if transform_column_name(original_key) == col:
-                original_col_name = original_key
-                break
-        
-        if original_col_name:
-            self.logger.info(f"Trying to find original column name '{original_col_name}' for normalized key '{col}'")
-            
-            # Try to find the original column name in Domo
-            domo_col = None
-            for domo_column in domo_df.columns:
-                if domo_column.lower() == original_col_name.lower():
-                    domo_col = domo_column
-                    break
-            
-            # Try to find the normalized column name in Snowflake
-            sf_col = None
-            for sf_column in sf_df.columns:
-                if sf_column.lower() == col.lower():
-                    sf_col = sf_column
-                    break
-            
-            if domo_col and sf_col:
-                self.logger.info(f"Found columns with original/normalized names: Domo '{domo_col}', Snowflake '{sf_col}'")
-                
-                # Rename both columns to the normalized name for datacompy
-                domo_df = domo_df.rename(columns={domo_col: col})
-                sf_df = sf_df.rename(columns={sf_col: col})
-                
-                self.logger.info(f"Renamed columns for datacompy compatibility: '{domo_col}' → '{col}', '{sf_col}' → '{col}'")
+    def _align_key_dtypes(self, domo_values: pd.Series,
+                          sf_values: pd.Series) -> Tuple[pd.Series, pd.Series, str]:
+        """
+        Cast a key column pair with different dtypes to one dtype datacompy can join on.
+        
+        Numeric keys become nullable Int64 (Float64 if any value is fractional), datetime
+        keys become UTC timestamps, and anything else falls back to the string dtype.
+        
+        Returns:
+            Tuple of (domo_values, sf_values, common dtype name)
+        """
+        api = pd.api.types
+        if all(api.is_numeric_dtype(v) and not api.is_bool_dtype(v) for v in (domo_values, sf_values)):
+            try:
+                return domo_values.astype('Int64'), sf_values.astype('Int64'), 'Int64'
+            except (TypeError, ValueError):
+                return domo_values.astype('Float64'), sf_values.astype('Float64'), 'Float64'
+        
+        if all(api.is_datetime64_any_dtype(v) for v in (domo_values, sf_values)):
+            return pd.to_datetime(domo_values, utc=True), pd.to_datetime(sf_values, utc=True), 'datetime (UTC)'
+        
+        return domo_values.astype('string'), sf_values.astype('string'), 'string'
+    
+    def _convert_string_columns(self, domo_df: pd.DataFrame, sf_df: pd.DataFrame) -> int:
+        """
+        Convert columns holding only strings on both sides to Arrow-backed strings, in place.
+        
+        datacompy then compares them with Arrow kernels instead of per-element Python
+        object comparisons. Columns with mixed values (e.g. Decimal, dates) stay object
+        so they keep comparing against the other side as before.
+        
+        Returns:
+            Number of columns converted (0 when pyarrow is not installed)
+        """
+        if ARROW_STRING_DTYPE is None or not (domo_df.columns.is_unique and sf_df.columns.is_unique):
+            return 0
+        
+        converted = 0
+        for col in domo_df.columns.intersection(sf_df.columns):
+            domo_values, sf_values = domo_df[col], sf_df[col]
+            if domo_values.dtype != object or sf_values.dtype != object:
+                continue
+            if (pd.api.types.infer_dtype(domo_values, skipna=True) != 'string'
+                    or pd.api.types.infer_dtype(sf_values, skipna=True) != 'string'):
+                continue
+            domo_df[col] = domo_values.astype(ARROW_STRING_DTYPE)
+            sf_df[col] = sf_values.astype(ARROW_STRING_DTYPE)
+            converted += 1
+        return converted
+    
+    def _present_renames(self, columns: List[str], mapping: Dict[str, str], source: str) -> Dict[str, str]:
+        """Keep the renames whose source column exists in columns, warning about the rest."""
+        existing = set(columns)
+        renames = {}
+        for old_col, new_col in mapping.items():
+            if old_col in existing:
+                renames[old_col] = new_col
             else:
-                self.logger.warning(f"Could not find matching columns for key '{col}' (original: '{original_col_name}'). Domo: {domo_col}, Snowflake: {sf_col}")
-        else:
+                self.logger.warning(f"⚠️ {source} column '{old_col}' not found in DataFrame")
+        return renames
+    
+    def _find_original_key_columns(self, domo_lookup: Dict[str, str], sf_lookup: Dict[str, str],
+                                   col: str, key_columns: List[str]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Handle cases where key column is not found in DataFrames.
+        
+        Args:
+            domo_lookup: Lowercased Domo column names mapped to actual names
+            sf_lookup: Lowercased Snowflake column names mapped to actual names
+            col: Normalized key column name
+            key_columns: Key columns as originally given (before normalization)
+            
+        Returns:
+            Tuple of (Domo column, Snowflake column) to rename to col, or (None, None)
+        """
+        # If column not found, try to find it with the original name (before normalization)
+        original_col_name = next((key for key in key_columns if transform_column_name(key) == col), None)
+        
+        if not original_col_name:
             self.logger.warning(f"Key column '{col}' not found in both DataFrames")
+            return None, None
+        
+        self.logger.info(f"Trying to find original column name '{original_col_name}' for normalized key '{col}'")
+        
+        # Try to find the original column name in Domo and the normalized one in Snowflake
+        domo_col = domo_lookup.get(original_col_name.lower())
+        sf_col = sf_lookup.get(col.lower())
+        
+        if domo_col and sf_col:
+            self.logger.info(f"Found columns with original/normalized names: Domo '{domo_col}', Snowflake '{sf_col}'")
+            return domo_col, sf_col
+        
+        self.logger.warning(f"Could not find matching columns for key '{col}' (original: '{original_col_name}'). Domo: {domo_col}, Snowflake: {sf_col}")
+        return None, None
     
     def _save_detailed_report(self, comparison: datacompy.Compare, domo_dataset_id: str, 
                             snowflake_table: str, key_columns: List[str], 
                             transform_names: bool, schema_comparison: Dict[str, Any] = None) -> str:
         """Save detailed comparison report to file."""
         # Use session timestamp if available, otherwise create new one
-        timestamp = self.session_timestamp or pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self.session_timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Use the provided Snowflake table name as base (now expected to be the Model Name)
-        safe_base = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(snowflake_table).strip()) or "report"
+        safe_base = _UNSAFE_FILENAME_CHARS_RE.sub("_", str(snowflake_table).strip()) or "report"
         
         # Create comparison directory structure with timestamp folder
         comparison_dir = f"results/comparison/{timestamp}"
-        os.makedirs(comparison_dir, exist_ok=True)
+        if comparison_dir not in self._created_dirs:
+            os.makedirs(comparison_dir, exist_ok=True)
+            self._created_dirs.add(comparison_dir)
         
         # Create report filename with timestamp
         report_filename = f"{comparison_dir}/{safe_base}_{timestamp}.txt"
         
-        with open(report_filename, 'w', encoding='utf-8') as f:
-            f.write(f"COMPARISON REPORT\n")
-            f.write(f"Domo Dataset: {domo_dataset_id}\n")
-            f.write(f"Snowflake Table: {snowflake_table}\n")
-            f.write(f"Key Columns: {', '.join(key_columns)}\n")
-            f.write(f"Transform Applied: {transform_names}\n")
-            f.write(f"Timestamp: {pd.Timestamp.now().isoformat()}\n")
-            f.write("="*80 + "\n")
+        # Get the datacompy report and modify it to include column names
+        datacompy_report = comparison.report()
+        
+        # Add column names information to the Column Summary section
+        if schema_comparison and not schema_comparison.get('error'):
+            # Get the actual column names from the DataFrames being compared
+            domo_cols_set = set(comparison.df1.columns)
+            sf_cols_set = set(comparison.df2.columns)
             
-            # Get the datacompy report and modify it to include column names
-            datacompy_report = comparison.report()
+            # Calculate the actual differences based on the DataFrames being compared
+            missing_in_sf = list(domo_cols_set - sf_cols_set)
+            extra_in_sf = list(sf_cols_set - domo_cols_set)
             
-            # Add column names information to the Column Summary section
-            if schema_comparison and not schema_comparison.get('error'):
-                # Get the actual column names from the DataFrames being compared
-                domo_cols_set = set(comparison.df1.columns)
-                sf_cols_set = set(comparison.df2.columns)
-                
-                # Calculate the actual differences based on the DataFrames being compared
-                missing_in_sf = list(domo_cols_set - sf_cols_set)
-                extra_in_sf = list(sf_cols_set - domo_cols_set)
-                
-                # Debug: print what we have
-                self.logger.info(f"DataFrame comparison debug:")
-                self.logger.info(f"  Domo columns: {list(domo_cols_set)}")
-                self.logger.info(f"  Snowflake columns: {list(sf_cols_set)}")
-                self.logger.info(f"  Missing in Snowflake: {missing_in_sf}")
-                self.logger.info(f"  Extra in Snowflake: {extra_in_sf}")
-                
-                # Find the Column Summary section and add column names
-                lines = datacompy_report.split('\n')
-                modified_lines = []
-                
-                for i, line in enumerate(lines):
-                    modified_lines.append(line)
-                    
-                    # After "Number of columns in Domo but not in Snowflake" line, add the column names
-                    if "Number of columns in Domo but not in Snowflake:" in line and missing_in_sf:
-                        missing_cols = ', '.join(missing_in_sf)
-                        modified_lines.append(f"Missing columns: {missing_cols}")
-                    
-                    # After "Number of columns in Snowflake but not in Domo" line, add the column names
-                    elif "Number of columns in Snowflake but not in Domo:" in line and extra_in_sf:
-                        extra_cols = ', '.join(extra_in_sf)
-                        modified_lines.append(f"Extra columns: {extra_cols}")
-                
-                # Write the modified report
-                f.write('\n'.join(modified_lines))
-            else:
-                # Write the original report if no schema comparison available
-                f.write(datacompy_report)
+            # Debug: print what we have
+            self.logger.debug(
+                "DataFrame comparison debug:\n  Domo columns: %s\n  Snowflake columns: %s\n"
+                "  Missing in Snowflake: %s\n  Extra in Snowflake: %s",
+                domo_cols_set, sf_cols_set, missing_in_sf, extra_in_sf
+            )
+            
+            # Add the column names after the matching Column Summary lines (one pass each)
+            if missing_in_sf:
+                datacompy_report = _append_after_lines(
+                    _MISSING_COLUMNS_LINE_RE, datacompy_report,
+                    f"Missing columns: {', '.join(missing_in_sf)}"
+                )
+            if extra_in_sf:
+                datacompy_report = _append_after_lines(
+                    _EXTRA_COLUMNS_LINE_RE, datacompy_report,
+                    f"Extra columns: {', '.join(extra_in_sf)}"
+                )
+        
+        # Build the whole report first, then write it with a single call
+        report_content = (
+            f"COMPARISON REPORT\n"
+            f"Domo Dataset: {domo_dataset_id}\n"
+            f"Snowflake Table: {snowflake_table}\n"
+            f"Key Columns: {', '.join(key_columns)}\n"
+            f"Transform Applied: {transform_names}\n"
+            f"Timestamp: {datetime.now().isoformat()}\n"
+            + "="*80 + "\n"
+            + datacompy_report
+        )
+        with open(report_filename, 'w', encoding='utf-8') as f:
+            f.write(report_content)
         
         self.logger.info(f"📄 Detailed report saved to: {report_filename}")
         return report_filename
     
     def _count_differing_rows(self, comparison: datacompy.Compare) -> int:
-        """Count rows with differences from datacompy comparison."""
+        """Count rows present in both samples with at least one differing value."""
         try:
-            if hasattr(comparison, 'column_stats') and comparison.column_stats is not None:
-                # Count rows where any column has differences
-                differing_columns = comparison.column_stats[comparison.column_stats['matches'] == False]
-                return len(differing_columns)
-            else:
-                return 0
-        except:
+            # count_matching_rows() is a vectorized all(axis=1) over the per-column match flags
+            return len(comparison.intersect_rows) - comparison.count_matching_rows()
+        except Exception:
             return 0
     
     def _get_error_data_result(self, sample_size: int, domo_rows: int = 0, 
@@ -5,29 +5,61 @@ This module provides the main DatasetComparator class that coordinates
 all comparison activities using specialized components.
 """
 
+import atexit
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 
 from .schema_comparator import SchemaComparator
 from .row_count_comparator import RowCountComparator
 from .data_comparator import DataComparator
 from .reporting.report_generator import ReportGenerator
-from .bulk_operations.spreadsheet_runner import SpreadsheetComparisonRunner
-from .bulk_operations.inventory_runner import InventoryComparisonRunner
-from ...utils.common import setup_dual_connections
-from ...api.domo import DomoHandler
-from ...api.snowflake import SnowflakeHandler
+from .domo_cache import DomoCache
+from .report_cache import ReportCache
+from ...utils.common import setup_dual_connections, get_env_config
 from ...utils.file_logger import get_file_logger, setup_file_logging, start_logging_session, end_logging_session, get_current_session_timestamp
-import pandas as pd
+
+# Bulk runners pull in the Google Sheets client; import them only when used
+if TYPE_CHECKING:
+    from ...api.domo import DomoHandler
+    from ...api.snowflake import SnowflakeHandler
+    from .bulk_operations.spreadsheet_runner import SpreadsheetComparisonRunner
+    from .bulk_operations.inventory_runner import InventoryComparisonRunner
+
+# Settings that identify a Domo/Snowflake connection (the one-time passcode is excluded
+# so a fresh TOTP does not discard an already authenticated session)
+_CONNECTION_ENV_KEYS = (
+    'SNOWFLAKE_USER', 'SNOWFLAKE_ACCOUNT', 'SNOWFLAKE_WAREHOUSE', 'SNOWFLAKE_DATABASE',
+    'SNOWFLAKE_SCHEMA', 'SNOWFLAKE_PRIVATE_KEY_PATH', 'SNOWFLAKE_AUTHENTICATOR',
+    'DOMO_DEVELOPER_TOKEN', 'DOMO_INSTANCE', 'DOMO_CLIENT_ID',
+)
+
+# Connected comparators shared within the process, keyed by connection settings
+_shared_comparators: Dict[tuple, "DatasetComparator"] = {}
+_shared_comparators_lock = threading.Lock()
+
+
+def _merge_errors(errors: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Copy an error list, keeping the first error per (section, error)."""
+    seen = set()
+    merged = []
+    for error in errors:
+        key = (error.get('section'), error.get('error'))
+        if key not in seen:
+            seen.add(key)
+            merged.append(error)
+    return merged
+
 
 class DatasetComparator:
     """Main class to compare Domo datasets with Snowflake tables using datacompy."""
     
     def __init__(self):
-        """Initialize the comparator with handlers for Domo and Snowflake."""
-        # Import handlers here to avoid circular imports
-        self.domo_handler = DomoHandler()
-        self.snowflake_handler = SnowflakeHandler()
+        """Initialize the comparator (Domo and Snowflake handlers are created on first use)."""
+        self._domo_handler = None
+        self._snowflake_handler = None
         self.errors = []
         self._domo_connected = False
         self._snowflake_connected = False
@@ -44,6 +76,37 @@ class DatasetComparator:
         self._report_generator = None
         self._spreadsheet_runner = None
         self._inventory_runner = None
+        
+        # Row count comparator with its own connections, run alongside the schema comparison
+        self._row_count_helper = None
+        self._row_count_helper_handlers = None
+        self._row_count_helper_unavailable = False
+        self._row_count_executor = None
+    
+    @property
+    def domo_handler(self) -> "DomoHandler":
+        """Get Domo handler instance."""
+        if self._domo_handler is None:
+            # Import handlers here to avoid circular imports
+            from ...api.domo import DomoHandler
+            self._domo_handler = DomoHandler()
+        return self._domo_handler
+    
+    @domo_handler.setter
+    def domo_handler(self, handler: "DomoHandler"):
+        self._domo_handler = handler
+    
+    @property
+    def snowflake_handler(self) -> "SnowflakeHandler":
+        """Get Snowflake handler instance."""
+        if self._snowflake_handler is None:
+            from ...api.snowflake import SnowflakeHandler
+            self._snowflake_handler = SnowflakeHandler()
+        return self._snowflake_handler
+    
+    @snowflake_handler.setter
+    def snowflake_handler(self, handler: "SnowflakeHandler"):
+        self._snowflake_handler = handler
     
     @property
     def schema_comparator(self) -> SchemaComparator:
@@ -63,7 +126,7 @@ class DatasetComparator:
     def data_comparator(self) -> DataComparator:
         """Get data comparator instance."""
         if self._data_comparator is None:
-            self._data_comparator = DataComparator(self.domo_handler, self.snowflake_handler)
+            self._data_comparator = DataComparator(self.domo_handler, self.snowflake_handler, errors=self.errors)
         return self._data_comparator
     
     @property
@@ -74,16 +137,18 @@ class DatasetComparator:
         return self._report_generator
     
     @property
-    def spreadsheet_runner(self) -> SpreadsheetComparisonRunner:
+    def spreadsheet_runner(self) -> "SpreadsheetComparisonRunner":
         """Get spreadsheet runner instance."""
         if self._spreadsheet_runner is None:
+            from .bulk_operations.spreadsheet_runner import SpreadsheetComparisonRunner
             self._spreadsheet_runner = SpreadsheetComparisonRunner(self)
         return self._spreadsheet_runner
     
     @property
-    def inventory_runner(self) -> InventoryComparisonRunner:
+    def inventory_runner(self) -> "InventoryComparisonRunner":
         """Get inventory runner instance."""
         if self._inventory_runner is None:
+            from .bulk_operations.inventory_runner import InventoryComparisonRunner
             self._inventory_runner = InventoryComparisonRunner(self)
         return self._inventory_runner
     
@@ -130,7 +195,10 @@ class DatasetComparator:
                        key_columns: List[str], sample_size: Optional[int] = None,
                        transform_names: bool = False, sampling_method: str = "random", 
                        use_session_logging: bool = True, export_debug_tables: bool = False,
-                       use_intelligent_mapping: bool = False) -> Dict[str, Any]:
+                       use_intelligent_mapping: bool = False,
+                       domo_cache: Optional[DomoCache] = None,
+                       report_cache: Optional[ReportCache] = None,
+                       early_exit_on_mismatch: bool = False) -> Dict[str, Any]:
         """
         Generate complete comparison report.
         
@@ -142,8 +210,14 @@ class DatasetComparator:
             transform_names: Whether to apply column name transformation
             sampling_method: Sampling method ('random' or 'ordered')
             use_session_logging: Whether to start/end logging session (set to False when called from other methods)
-            export_debug_tables: If True, export the comparison tables as CSV files to results/debug/ for debugging
+            export_debug_tables: If True, export the comparison tables (Parquet by default, see DEBUG_EXPORT_FORMAT) to results/debug/ for debugging
             use_intelligent_mapping: Whether to use intelligent column mapping with Levenshtein
+            domo_cache: Optional Domo metadata cache shared across comparisons of the same dataset
+            report_cache: Optional report cache shared across the comparisons of a bulk run;
+                repeated comparisons of the same inputs reuse the first report (without
+                its datacompy comparison object)
+            early_exit_on_mismatch: If True, skip the data comparison (sampling + datacompy)
+                when the schema or row count comparison already rules out an overall match
             
         Returns:
             Complete comparison report dictionary
@@ -163,8 +237,8 @@ class DatasetComparator:
                 domo_dataset_id, snowflake_table, key_columns, transform_names
             )
         
-            # Clear previous errors
-            self.errors = []
+            # Clear previous errors (in place: the data comparator appends to the same list)
+            self.errors.clear()
             
             # Setup connections if needed
             if not self._domo_connected or not self._snowflake_connected:
@@ -173,69 +247,176 @@ class DatasetComparator:
                         domo_dataset_id, snowflake_table, key_columns, transform_names
                     )
             
-            # Perform comparisons using specialized components
-            schema_comparison = self.schema_comparator.compare_schemas(
-                domo_dataset_id, snowflake_table, transform_names, use_intelligent_mapping
+            def build_report() -> Dict[str, Any]:
+                return self._build_report(
+                    domo_dataset_id, snowflake_table, key_columns, sample_size, transform_names,
+                    sampling_method, export_debug_tables, use_intelligent_mapping, domo_cache,
+                    session_timestamp, early_exit_on_mismatch
+                )
+            
+            if report_cache is None:
+                return build_report()
+            
+            key = ReportCache.make_key(
+                domo_dataset_id, snowflake_table, key_columns, sample_size, sampling_method,
+                transform_names, use_intelligent_mapping, early_exit_on_mismatch
             )
+            report, cached = report_cache.get_or_compute(key, build_report)
+            if cached:
+                # A reused report is still this comparison's result: stamp and log it as new
+                report['timestamp'] = datetime.now().isoformat()
+                self.file_logger.log_comparison_result(report)
+            return report
             
+        finally:
+            # End logging session if it was started by this method
+            if use_session_logging:
+                end_logging_session()
+    
+    def _build_report(self, domo_dataset_id: str, snowflake_table: str, key_columns: List[str],
+                      sample_size: Optional[int], transform_names: bool, sampling_method: str,
+                      export_debug_tables: bool, use_intelligent_mapping: bool,
+                      domo_cache: Optional[DomoCache], session_timestamp: Optional[str],
+                      early_exit_on_mismatch: bool = False) -> Dict[str, Any]:
+        """Run the schema, row count and data comparisons and assemble the report."""
+        # Schema and row count are fetched from Domo once even when not shared across runs
+        if domo_cache is None:
+            domo_cache = DomoCache()
+        
+        # Perform comparisons using specialized components. Row counts do not depend on the
+        # schema, so when a second pair of connections is available they are queried on a
+        # helper thread while the schema is compared (the two only share domo_cache, which
+        # is thread-safe).
+        row_count_helper = self._get_row_count_helper()
+        if row_count_helper is not None:
+            row_count_future = self._row_count_executor.submit(
+                row_count_helper.compare_row_counts, domo_dataset_id, snowflake_table, domo_cache
+            )
+        
+        schema_comparison = self.schema_comparator.compare_schemas(
+            domo_dataset_id, snowflake_table, transform_names, use_intelligent_mapping, domo_cache
+        )
+        
+        if row_count_helper is not None:
+            row_count_comparison = row_count_future.result()
+        else:
             row_count_comparison = self.row_count_comparator.compare_row_counts(
-                domo_dataset_id, snowflake_table
+                domo_dataset_id, snowflake_table, domo_cache
             )
-            
-            # Get column mapping from schema comparator for data comparison
-            domo_column_mapping = self.schema_comparator.domo_original_columns
-            
-            # Set session timestamp in data comparator
-            # Use current session timestamp if available, even when use_session_logging is False
-            current_timestamp = session_timestamp or get_current_session_timestamp()
-            if current_timestamp:
-                self.data_comparator.set_session_timestamp(current_timestamp)
-            
-            # Get intelligent mapping from schema comparator if available
-            intelligent_mapping = None
-            if use_intelligent_mapping and hasattr(self.schema_comparator, 'intelligent_mapping'):
-                intelligent_mapping = self.schema_comparator.intelligent_mapping
-            
+        
+        # Column mappings found by the schema comparison, reused for the data comparison
+        domo_column_mapping, intelligent_mapping = self._schema_mappings(use_intelligent_mapping)
+        
+        # Set session timestamp in data comparator
+        # Use current session timestamp if available, even when use_session_logging is False
+        current_timestamp = session_timestamp or get_current_session_timestamp()
+        if current_timestamp:
+            self.data_comparator.set_session_timestamp(current_timestamp)
+        
+        if early_exit_on_mismatch and not self._schema_and_row_count_ok(schema_comparison, row_count_comparison):
+            self.logger.info("⏭️  Skipping data comparison: schema or row count already mismatched")
+            data_comparison = self._get_skipped_data_result(sampling_method)
+        else:
             data_comparison = self.data_comparator.compare_data_samples(
                 domo_dataset_id, snowflake_table, key_columns, sample_size, 
                 transform_names, schema_comparison, sampling_method, export_debug_tables,
-                domo_column_mapping, use_intelligent_mapping, intelligent_mapping
+                domo_column_mapping, use_intelligent_mapping, intelligent_mapping, domo_cache
             )
             
-            # Determine overall match
-            overall_match = False
-            if not schema_comparison.get('error') and not data_comparison.get('error'):
-                row_count_ok = (row_count_comparison['match'] or 
-                              row_count_comparison.get('negligible_analysis', {}).get('is_negligible', False))
-                
-                overall_match = (schema_comparison['schema_match'] and 
-                               row_count_ok and 
-                               data_comparison.get('data_match', False))
-            
-            # Build result
-            result = {
-                'domo_dataset_id': domo_dataset_id,
-                'snowflake_table': snowflake_table,
-                'key_columns': key_columns,
-                'overall_match': overall_match,
-                'schema_comparison': schema_comparison,
-                'row_count_comparison': row_count_comparison,
-                'data_comparison': data_comparison,
-                'errors': self.errors + self.data_comparator.errors,  # Combine errors from all components
-                'timestamp': pd.Timestamp.now().isoformat(),
-                'transform_applied': transform_names,
-                'use_intelligent_mapping': use_intelligent_mapping
-            }
-            
-            # Log result to file
-            self.file_logger.log_comparison_result(result)
+            # Debug tables were written while the data comparison ran
+            self.data_comparator.wait_for_exports()
+        
+        # Determine overall match
+        overall_match = False
+        if not schema_comparison.get('error') and not data_comparison.get('error'):
+            overall_match = (self._schema_and_row_count_ok(schema_comparison, row_count_comparison) and
+                             data_comparison.get('data_match', False))
+        
+        # Build result
+        result = {
+            'domo_dataset_id': domo_dataset_id,
+            'snowflake_table': snowflake_table,
+            'key_columns': key_columns,
+            'overall_match': overall_match,
+            'schema_comparison': schema_comparison,
+            'row_count_comparison': row_count_comparison,
+            'data_comparison': data_comparison,
+            'errors': _merge_errors(self.errors),  # Errors from all components, in order
+            'timestamp': datetime.now().isoformat(),
+            'transform_applied': transform_names,
+            'use_intelligent_mapping': use_intelligent_mapping
+        }
+        
+        # Log result to file
+        self.file_logger.log_comparison_result(result)
+        
+        return result
+    
+    @staticmethod
+    def _schema_and_row_count_ok(schema_comparison: Dict[str, Any],
+                                 row_count_comparison: Dict[str, Any]) -> bool:
+        """Whether schemas match and row counts match (or differ negligibly)."""
+        if not schema_comparison.get('schema_match'):
+            return False
+        return bool(row_count_comparison.get('match') or
+                    row_count_comparison.get('negligible_analysis', {}).get('is_negligible', False))
+    
+    @staticmethod
+    def _get_skipped_data_result(sampling_method: str) -> Dict[str, Any]:
+        """Data comparison result used when the comparison was skipped."""
+        return {
+            'sample_size': 0,
+            'domo_sample_rows': 0,
+            'snowflake_sample_rows': 0,
+            'data_match': False,
+            'missing_in_snowflake': 0,
+            'extra_in_snowflake': 0,
+            'rows_with_differences': 0,
+            'sampling_method': sampling_method,
+            'skipped': True
+        }
+    
+    def _get_row_count_helper(self) -> Optional[RowCountComparator]:
+        """
+        Get the row count comparator that runs alongside the schema comparison.
+        
+        It has its own Domo client and Snowflake connection: the schema comparison
+        switches the role of this comparator's Snowflake session, and neither client
+        is thread-safe. No helper is opened when a one-time passcode is configured
+        (it cannot authenticate a second connection) or when connecting fails; row
+        counts are then compared after the schema on the main connections.
+        
+        Returns:
+            Connected RowCountComparator, or None to compare row counts sequentially
+        """
+        if self._row_count_helper is None and not self._row_count_helper_unavailable:
+            if not self._snowflake_connected or get_env_config().get('SNOWFLAKE_PASSCODE'):
+                self._row_count_helper_unavailable = True
+                return None
             
-            return result
+            success, domo_handler, snowflake_handler = setup_dual_connections()
+            if not success:
+                self.logger.warning("⚠️  Could not open row count connections, comparing row counts sequentially")
+                if snowflake_handler:
+                    snowflake_handler.cleanup()
+                self._row_count_helper_unavailable = True
+                return None
             
-        finally:
-            # End logging session if it was started by this method
-            if use_session_logging:
-                end_logging_session()
+            self._row_count_helper_handlers = (domo_handler, snowflake_handler)
+            self._row_count_helper = RowCountComparator(domo_handler, snowflake_handler)
+            self._row_count_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="row-count")
+        return self._row_count_helper
+    
+    def _schema_mappings(self, use_intelligent_mapping: bool) -> tuple:
+        """
+        Get the column mappings recorded by the last schema comparison.
+        
+        Returns:
+            Tuple of (Domo original column names, intelligent mapping or None when not used)
+        """
+        schema_comparator = self.schema_comparator
+        intelligent_mapping = schema_comparator.intelligent_mapping if use_intelligent_mapping else None
+        return schema_comparator.domo_original_columns, intelligent_mapping
     
     # Backward compatibility methods - delegate to specialized components
     def compare_schemas(self, domo_dataset_id: str, snowflake_table: str, 
@@ -253,13 +434,7 @@ class DatasetComparator:
                            sampling_method: str = "random", export_debug_tables: bool = False,
                            use_intelligent_mapping: bool = False) -> Dict[str, Any]:
         """Compare data samples using datacompy."""
-        # Get column mapping from schema comparator
-        domo_column_mapping = self.schema_comparator.domo_original_columns
-        
-        # Get intelligent mapping from schema comparator if available
-        intelligent_mapping = None
-        if use_intelligent_mapping and hasattr(self.schema_comparator, 'intelligent_mapping'):
-            intelligent_mapping = self.schema_comparator.intelligent_mapping
+        domo_column_mapping, intelligent_mapping = self._schema_mappings(use_intelligent_mapping)
         
         return self.data_comparator.compare_data_samples(
             domo_dataset_id, snowflake_table, key_columns, sample_size, 
@@ -273,21 +448,96 @@ class DatasetComparator:
     
     def compare_from_spreadsheet(self, spreadsheet_id: str, sheet_name: str = None,
                                 credentials_path: str = None, sampling_method: str = "random", 
-                                export_debug_tables: bool = False) -> Dict[str, Any]:
-        """Compare multiple datasets from Google Sheets configuration."""
+                                export_debug_tables: bool = False,
+                                max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compare multiple datasets from Google Sheets configuration.
+        
+        Rows are compared by max_workers concurrent workers, each with its own
+        connections (uses ARGO_COMPARE_WORKERS if None, sequential by default).
+        """
         return self.spreadsheet_runner.run_comparisons(
-            spreadsheet_id, sheet_name, credentials_path, sampling_method, export_debug_tables
+            spreadsheet_id, sheet_name, credentials_path, sampling_method, export_debug_tables, max_workers
         )
     
     def compare_from_inventory(self, credentials_path: str = None, sampling_method: str = "random", 
-                              export_debug_tables: bool = False) -> Dict[str, Any]:
-        """Compare datasets from the existing inventory spreadsheet."""
-        return self.inventory_runner.run_comparisons(credentials_path, sampling_method, export_debug_tables)
+                              export_debug_tables: bool = False,
+                              max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Compare datasets from the existing inventory spreadsheet (max_workers as in compare_from_spreadsheet)."""
+        return self.inventory_runner.run_comparisons(
+            credentials_path, sampling_method, export_debug_tables, max_workers
+        )
+    
+    def wait_for_exports(self):
+        """Block until this comparator's background debug exports have been written."""
+        if self._data_comparator:
+            self._data_comparator.wait_for_exports()
+    
+    def close_connections(self):
+        """Close this comparator's Snowflake connections (file logging is left open)."""
+        if self._row_count_executor:
+            self._row_count_executor.shutdown(wait=True)
+            self._row_count_executor = None
+        
+        if self._row_count_helper_handlers:
+            self._row_count_helper_handlers[1].cleanup()
+            self._row_count_helper_handlers = None
+            self._row_count_helper = None
+        
+        if self._snowflake_handler:
+            self._snowflake_handler.cleanup()
     
     def cleanup(self):
         """Clean up resources."""
-        if self.snowflake_handler:
-            self.snowflake_handler.cleanup()
+        self.wait_for_exports()
+        self.close_connections()
         
         # Close file logging
         self.file_logger.close_loggers()
+
+
+def get_connection_key() -> tuple:
+    """Identify the current Domo/Snowflake connection settings (used to key shared comparators)."""
+    env_config = get_env_config()
+    return tuple(env_config.get(name) for name in _CONNECTION_ENV_KEYS)
+
+
+def get_comparator() -> DatasetComparator:
+    """
+    Get a connected DatasetComparator shared by all callers in this process.
+    
+    Repeated bulk runs (notebooks, retry loops, scripts calling the CLI functions)
+    reuse the authenticated Domo client and Snowflake connection instead of
+    reconnecting each time. Changing the connection settings yields a new comparator.
+    The instance is not thread-safe; concurrent work should use one comparator per thread.
+    
+    Returns:
+        Connected DatasetComparator
+    """
+    key = get_connection_key()
+    
+    with _shared_comparators_lock:
+        comparator = _shared_comparators.get(key)
+        if comparator is None:
+            comparator = DatasetComparator()
+            if not comparator.setup_connections():
+                raise Exception("Failed to setup connections")
+            _shared_comparators[key] = comparator
+        return comparator
+
+
+def close_shared_comparators():
+    """Close the connections held by shared comparators."""
+    with _shared_comparators_lock:
+        comparators = list(_shared_comparators.values())
+        _shared_comparators.clear()
+    
+    for comparator in comparators:
+        try:
+            comparator.wait_for_exports()
+            comparator.close_connections()
+        except Exception:
+            pass  # Ignore cleanup errors at shutdown
+
+
+atexit.register(close_shared_comparators)
@@ -0,0 +1,107 @@
+"""
+Per-run cache of Domo dataset metadata.
+
+Bulk runs often compare one Domo dataset against several Snowflake tables. A
+dataset's schema and row count do not depend on the table it is compared with,
+so they are fetched once per dataset ID and reused by every comparison that
+shares the cache. The cache is shared by the worker threads of a run: while one
+worker fetches a value, workers asking for the same value wait for it instead of
+querying Domo again.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ...api.domo import DomoHandler
+
+ROW_COUNT_QUERY = "SELECT COUNT(*) as row_count FROM table"
+
+
+class DomoCache:
+    """Thread-safe memo of Domo dataset metadata for one run."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, str], Any] = {}  # (dataset_id, field) -> value
+        self._pending: Dict[Tuple[str, str], threading.Event] = {}
+
+    def get_or_fetch(self, dataset_id: str, field: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached value of a dataset field, fetching it on a miss.
+
+        Only one thread fetches a given field at a time; the others wait for it.
+        Failed fetches (None or an exception) are not cached, so a waiting thread
+        fetches the value itself when the first attempt fails.
+
+        Args:
+            dataset_id: Domo dataset ID
+            field: Metadata name ('schema' or 'row_count')
+            fetch: Callable returning the value
+
+        Returns:
+            The cached or fetched value
+        """
+        key = (dataset_id, field)
+        while True:
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    break
+
+            pending.wait()
+
+        try:
+            value = fetch()
+            if value is not None:
+                with self._lock:
+                    self._values[key] = value
+            return value
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+
+def get_domo_schema(domo_handler: DomoHandler, dataset_id: str,
+                    domo_cache: Optional[DomoCache] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get a Domo dataset schema, reusing the cached copy when available.
+
+    Args:
+        domo_handler: Authenticated Domo handler
+        dataset_id: Domo dataset ID
+        domo_cache: Optional cache shared across comparisons
+
+    Returns:
+        Dataset schema, or None if it could not be fetched (failures are not cached)
+    """
+    if domo_cache is None:
+        return domo_handler.get_dataset_schema(dataset_id)
+    return domo_cache.get_or_fetch(dataset_id, 'schema', lambda: domo_handler.get_dataset_schema(dataset_id))
+
+
+def get_domo_row_count(domo_handler: DomoHandler, dataset_id: str,
+                       domo_cache: Optional[DomoCache] = None) -> int:
+    """
+    Get a Domo dataset row count, reusing the cached value when available.
+
+    Args:
+        domo_handler: Authenticated Domo handler
+        dataset_id: Domo dataset ID
+        domo_cache: Optional cache shared across comparisons
+
+    Returns:
+        Number of rows in the dataset (query errors propagate and are not cached)
+    """
+    def fetch() -> int:
+        domo_result = domo_handler.query_dataset(dataset_id, ROW_COUNT_QUERY)
+        return domo_result['rows'][0][0] if domo_result['rows'] else 0
+
+    if domo_cache is None:
+        return fetch()
+    return domo_cache.get_or_fetch(dataset_id, 'row_count', fetch)
@@ -0,0 +1,110 @@
+"""
+Per-run cache of comparison reports.
+
+A bulk run can list the same Domo dataset / Snowflake table pair more than
+once. Comparing identical inputs again only repeats the Domo and Snowflake
+round-trips, so reports are memoized on the comparison inputs and handed out
+as copies. The cache is shared by the worker threads of a run: while one worker
+computes a report, workers asking for the same key wait for it instead of
+running the comparison a second time.
+
+The datacompy Compare object (which holds both sampled DataFrames) is kept for
+the lifetime of the cache so executive summaries of repeated rows are as
+detailed as the first one. It is shared by reference between copies rather
+than deep-copied, so memory grows with the number of distinct comparisons
+only. Callers must treat it as read-only.
+"""
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Cached reports are reused for this many seconds
+REPORT_CACHE_TTL_SECONDS = 3600
+
+# data_comparison entries too large to deep-copy; copies share them by reference
+SHARED_DATA_KEYS = ('comparison_object',)
+
+
+def _report_copy(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep copy of a report that shares the SHARED_DATA_KEYS of its data comparison."""
+    data_comparison = report.get('data_comparison')
+    memo = {}
+    if isinstance(data_comparison, dict):
+        # deepcopy returns memoized objects as they are
+        memo = {id(data_comparison[key]): data_comparison[key]
+                for key in SHARED_DATA_KEYS if key in data_comparison}
+    return copy.deepcopy(report, memo)
+
+
+class ReportCache:
+    """Thread-safe memo of generate_report results for one bulk run."""
+
+    def __init__(self, ttl_seconds: float = REPORT_CACHE_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long a cached report stays valid
+        """
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._reports: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}  # key -> (monotonic timestamp, report)
+        self._pending: Dict[tuple, threading.Event] = {}
+
+    @staticmethod
+    def make_key(domo_dataset_id: str, snowflake_table: str, key_columns: List[str],
+                 sample_size: Optional[int], sampling_method: str, transform_names: bool,
+                 use_intelligent_mapping: bool, early_exit_on_mismatch: bool = False) -> tuple:
+        """Build the cache key for a comparison (key column order does not matter)."""
+        return (domo_dataset_id, snowflake_table, tuple(sorted(key_columns)),
+                sample_size, sampling_method, transform_names, use_intelligent_mapping,
+                early_exit_on_mismatch)
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return a copy of the cached report for key, computing it on a miss.
+
+        Only one thread computes a given key at a time; the others wait for it.
+        Reports with errors are not cached, so a waiting thread retries the
+        comparison itself when the first attempt fails. Cached copies share the
+        first report's data_comparison['comparison_object'].
+
+        Args:
+            key: Cache key from make_key()
+            compute: Callable producing the report
+
+        Returns:
+            Tuple of (comparison report the caller may modify, whether it came from the cache)
+        """
+        while True:
+            with self._lock:
+                cached = self._reports.get(key)
+                if cached is not None:
+                    if time.monotonic() - cached[0] < self.ttl_seconds:
+                        return _report_copy(cached[1]), True
+                    del self._reports[key]
+
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    break
+
+            pending.wait()
+
+        try:
+            report = compute()
+            if not report.get('errors'):
+                with self._lock:
+                    self._reports[key] = (time.monotonic(), _report_copy(report))
+            return report, False
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+
+    def clear(self):
+        """Forget all cached reports."""
+        with self._lock:
+            self._reports.clear()
@@ -1,32 +1,135 @@
 """
 Debug file export utilities for data comparison debugging.
 
-This module provides functionality to export comparison tables as CSV files
-with metadata for detailed debugging and analysis.
+This module provides functionality to export comparison tables as Parquet
+(or CSV) files for detailed debugging and analysis. Each debug folder has a
+manifest.jsonl with one JSON line of metadata per exported comparison.
 """
 
 import os
 import re
+import json
 import logging
-from typing import List
+import threading
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
 import pandas as pd
 
+from ....utils.common import TRUTHY_VALUES, get_env_config
 from ....utils.file_logger import get_file_logger
 
+# Parquet keeps dtypes and is much smaller/faster to write; it needs pyarrow (a declared
+# dependency; the CSV fallback only covers environments installed without it)
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Supported table formats and their file extensions
+EXPORT_FORMATS = {
+    'parquet': '.parquet',
+    'csv': '.csv',
+}
+
+# Per-folder metadata index; appends from all exporters are serialized
+MANIFEST_FILENAME = "manifest.jsonl"
+_manifest_lock = threading.Lock()
+
+# Key column sample size, and the longest text value kept per sample
+KEY_SAMPLE_ROWS = 10
+MAX_SAMPLE_VALUE_CHARS = 200
+
+# Text columns with fewer distinct values than this share of rows become categories
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Characters not allowed in debug file names
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# Debug files are written in the background so disk I/O overlaps the comparison
+_export_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="debug-export")
+# Writes the Snowflake table while the export thread writes the Domo one (a separate
+# pool, so export tasks never wait on work queued behind themselves)
+_table_write_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="debug-table-write")
+
+
+def _key_samples(df: pd.DataFrame, key_columns: List[str]) -> Dict[str, list]:
+    """
+    First KEY_SAMPLE_ROWS values of each key column present in df (sliced once).
+    
+    Text values of object columns are cut to MAX_SAMPLE_VALUE_CHARS so a "key"
+    holding JSON or long text cannot blow up the manifest.
+    """
+    present = [col for col in key_columns if col in df.columns]
+    head = df.loc[:, present].head(KEY_SAMPLE_ROWS)
+    samples = head.to_dict('list')
+    for col in head.columns[(head.dtypes == object).to_numpy()]:
+        samples[col] = [
+            value[:MAX_SAMPLE_VALUE_CHARS] if isinstance(value, str) else value
+            for value in samples[col]
+        ]
+    return samples
+
+
+def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink a table for export: downcast numeric columns and turn text columns with
+    few distinct values (below CATEGORY_MAX_UNIQUE_RATIO of the rows) into categories.
+    
+    Returns:
+        A new DataFrame (df itself is not modified)
+    """
+    optimized = df.copy(deep=False)
+    for col in optimized.columns:
+        values = optimized[col]
+        if values.dtype.kind in 'iu':
+            optimized[col] = pd.to_numeric(values, downcast='integer')
+        elif values.dtype.kind == 'f':
+            optimized[col] = pd.to_numeric(values, downcast='float')
+        elif values.dtype == object and len(values) > 0:
+            if values.nunique(dropna=True) / len(values) < CATEGORY_MAX_UNIQUE_RATIO:
+                optimized[col] = values.astype('category')
+    return optimized
+
 
 class DebugExporter:
     """Export comparison tables and metadata for debugging."""
     
-    def __init__(self):
-        """Initialize debug exporter."""
+    def __init__(self, export_format: Optional[str] = None, optimize_dtypes: Optional[bool] = None):
+        """
+        Initialize debug exporter.
+        
+        Args:
+            export_format: 'parquet' or 'csv' (uses DEBUG_EXPORT_FORMAT env var if None, default parquet)
+            optimize_dtypes: If True, downcast numeric columns and store repetitive text
+                columns as categories before writing (smaller files, but the written
+                dtypes no longer match the compared frames). Uses the
+                DEBUG_EXPORT_OPTIMIZE_DTYPES env var if None (default off)
+        """
         self.logger = logging.getLogger("DebugExporter")
         self.file_logger = get_file_logger()
+        env_config = get_env_config()
+        if export_format is None:
+            export_format = env_config.get('DEBUG_EXPORT_FORMAT', 'parquet')
+        self.export_format = export_format.strip().lower()
+        if optimize_dtypes is None:
+            optimize_dtypes = env_config.get('DEBUG_EXPORT_OPTIMIZE_DTYPES', 'false').strip().lower() in TRUTHY_VALUES
+        self.optimize_dtypes = optimize_dtypes
+        # Debug directories already created by this exporter (one per session)
+        self._created_dirs = set()
     
     def export_comparison_tables(self, domo_df: pd.DataFrame, sf_df: pd.DataFrame, 
                                domo_dataset_id: str, snowflake_table: str, 
-                               key_columns: List[str]) -> None:
+                               key_columns: List[str], export_format: Optional[str] = None,
+                               timestamp: Optional[str] = None) -> Future:
         """
-        Export the tables that will be compared with datacompy as CSV files for debugging.
+        Export the tables that will be compared with datacompy for debugging.
+        
+        Tables are written as snappy-compressed Parquet by default, which keeps the
+        column dtypes; CSV is used when requested or when pyarrow is not installed.
+        The files are written on a background thread from shallow copies of the
+        frames, so the caller may keep replacing columns while the export runs.
         
         Args:
             domo_df: Domo DataFrame
@@ -34,72 +137,112 @@ class DebugExporter:
             domo_dataset_id: Domo dataset ID
             snowflake_table: Snowflake table name
             key_columns: Key columns for comparison
+            export_format: 'parquet' or 'csv' (defaults to self.export_format)
+            timestamp: Session timestamp used for the debug folder and file names
+                (the current time if None)
+            
+        Returns:
+            Future that completes once the files are written (failures are logged, not raised)
         """
-        # Get current timestamp for directory structure
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+        generated_at = datetime.now()
+        timestamp = timestamp or generated_at.strftime("%Y%m%d_%H%M%S")
+        return _export_pool.submit(
+            self._export_tables, domo_df.copy(deep=False), sf_df.copy(deep=False),
+            domo_dataset_id, snowflake_table, list(key_columns), export_format,
+            timestamp, generated_at
+        )
+    
+    def _export_tables(self, domo_df: pd.DataFrame, sf_df: pd.DataFrame,
+                       domo_dataset_id: str, snowflake_table: str,
+                       key_columns: List[str], export_format: Optional[str],
+                       timestamp: str, generated_at: datetime) -> None:
+        """Write the comparison tables and add their manifest entry."""
+        export_format = (export_format or self.export_format).lower()
+        if export_format not in EXPORT_FORMATS:
+            self.logger.warning(f"⚠️  Unknown debug export format '{export_format}', using CSV")
+            export_format = 'csv'
+        elif export_format == 'parquet' and not PARQUET_AVAILABLE:
+            self.logger.warning("⚠️  pyarrow is not installed, exporting debug tables as CSV")
+            export_format = 'csv'
         
         # Create debug directory with timestamp folder
         debug_dir = f"results/debug/{timestamp}"
-        os.makedirs(debug_dir, exist_ok=True)
+        if debug_dir not in self._created_dirs:
+            os.makedirs(debug_dir, exist_ok=True)
+            self._created_dirs.add(debug_dir)
         
         # Clean table name for filename
-        safe_table_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(snowflake_table).strip()) or "unknown_table"
+        safe_table_name = _UNSAFE_FILENAME_CHARS_RE.sub("_", str(snowflake_table).strip()) or "unknown_table"
         
         # Create descriptive filenames
-        domo_filename = f"{safe_table_name}_domo_data_{timestamp}.csv"
-        snowflake_filename = f"{safe_table_name}_snowflake_data_{timestamp}.csv"
-        info_filename = f"{safe_table_name}_comparison_info_{timestamp}.txt"
-        
-        # Export DataFrames to CSV
-        domo_filepath = os.path.join(debug_dir, domo_filename)
-        snowflake_filepath = os.path.join(debug_dir, snowflake_filename)
-        info_filepath = os.path.join(debug_dir, info_filename)
+        domo_basename = f"{safe_table_name}_domo_data_{timestamp}"
+        snowflake_basename = f"{safe_table_name}_snowflake_data_{timestamp}"
+        manifest_filepath = os.path.join(debug_dir, MANIFEST_FILENAME)
         
         try:
-            # Save Domo data
-            domo_df.to_csv(domo_filepath, index=False, encoding='utf-8')
-            self.logger.info(f"💾 Exported Domo data: {domo_filepath}")
+            # Save Domo and Snowflake data concurrently (independent files)
+            snowflake_future = _table_write_pool.submit(
+                self._write_table, sf_df, debug_dir, snowflake_basename, export_format
+            )
+            domo_filename = self._write_table(domo_df, debug_dir, domo_basename, export_format)
+            self.logger.info(f"💾 Exported Domo data: {os.path.join(debug_dir, domo_filename)}")
+            
+            snowflake_filename = snowflake_future.result()
+            self.logger.info(f"💾 Exported Snowflake data: {os.path.join(debug_dir, snowflake_filename)}")
             
-            # Save Snowflake data
-            sf_df.to_csv(snowflake_filepath, index=False, encoding='utf-8')
-            self.logger.info(f"💾 Exported Snowflake data: {snowflake_filepath}")
+            domo_samples = _key_samples(domo_df, key_columns)
+            sf_samples = _key_samples(sf_df, key_columns)
             
-            # Create info file with metadata
-            with open(info_filepath, 'w', encoding='utf-8') as f:
-                f.write("COMPARISON DEBUG INFO\n")
-                f.write("="*50 + "\n")
-                f.write(f"Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Domo Dataset ID: {domo_dataset_id}\n")
-                f.write(f"Snowflake Table: {snowflake_table}\n")
-                f.write(f"Key Columns: {', '.join(key_columns)}\n")
-                f.write(f"Domo Shape: {domo_df.shape}\n")
-                f.write(f"Snowflake Shape: {sf_df.shape}\n")
-                f.write("\nColumn Comparison:\n")
-                f.write("-" * 30 + "\n")
-                f.write(f"Domo columns ({len(domo_df.columns)}): {list(domo_df.columns)}\n")
-                f.write(f"Snowflake columns ({len(sf_df.columns)}): {list(sf_df.columns)}\n")
-                
-                # Key column sample values
-                f.write("\nKey Column Sample Values (First 10):\n")
-                f.write("-" * 30 + "\n")
-                for key_col in key_columns:
-                    if key_col in domo_df.columns:
-                        domo_key_values = domo_df[key_col].head(10).tolist()
-                        f.write(f"Domo '{key_col}': {domo_key_values}\n")
-                    if key_col in sf_df.columns:
-                        sf_key_values = sf_df[key_col].head(10).tolist()
-                        f.write(f"Snowflake '{key_col}': {sf_key_values}\n")
-                
-                f.write("\nFiles Generated:\n")
-                f.write("-" * 15 + "\n")
-                f.write(f"Domo CSV: {domo_filename}\n")
-                f.write(f"Snowflake CSV: {snowflake_filename}\n")
-                f.write(f"Info file: {info_filename}\n")
+            # Describe the comparison with one manifest line
+            entry = {
+                'generated': generated_at.isoformat(),
+                'domo_dataset_id': domo_dataset_id,
+                'snowflake_table': snowflake_table,
+                'key_columns': key_columns,
+                'domo_shape': list(domo_df.shape),
+                'snowflake_shape': list(sf_df.shape),
+                'domo_columns': domo_df.columns.tolist(),
+                'snowflake_columns': sf_df.columns.tolist(),
+                'domo_key_samples': domo_samples,
+                'snowflake_key_samples': sf_samples,
+                'domo_file': domo_filename,
+                'snowflake_file': snowflake_filename,
+            }
+            line = json.dumps(entry, default=str) + "\n"
+            with _manifest_lock:
+                with open(manifest_filepath, 'a', encoding='utf-8') as f:
+                    f.write(line)
             
-            self.logger.info(f"💾 Exported comparison info: {info_filepath}")
+            self.logger.info(f"💾 Added comparison info to: {manifest_filepath}")
             self.logger.info(f"🗂 Debug files saved in: {debug_dir}/")
             
         except Exception as e:
             self.logger.error(f"❌ Failed to export debug tables: {str(e)}")
             # Log to file logger as well
             self.file_logger.log_error("Debug Export", "Failed to save debug tables", str(e))
+    
+    def _write_table(self, df: pd.DataFrame, debug_dir: str, basename: str, export_format: str) -> tuple:
+        """
+        Write one comparison table in the requested format.
+        
+        Parquet cannot store some object columns (e.g. mixed types); such tables
+        fall back to CSV so the debug export is never lost.
+        
+        Returns:
+            File name written
+        """
+        if self.optimize_dtypes:
+            df = _optimize_dtypes(df)
+        
+        if export_format == 'parquet':
+            filename = basename + EXPORT_FORMATS['parquet']
+            try:
+                df.to_parquet(os.path.join(debug_dir, filename), engine='pyarrow',
+                              compression='snappy', index=False)
+                return filename
+            except Exception as e:
+                self.logger.warning(f"⚠️  Could not write {filename} as Parquet ({e}), using CSV")
+        
+        filename = basename + EXPORT_FORMATS['csv']
+        df.to_csv(os.path.join(debug_dir, filename), index=False, encoding='utf-8')
+        return filename
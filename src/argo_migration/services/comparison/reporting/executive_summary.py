@@ -6,12 +6,54 @@ of data comparison results with visual indicators and key insights.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
 import pandas as pd
 import datacompy
 
 from ....utils.common import get_env_config
 
+# Timestamp format of the summary header line
+SUMMARY_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+# column_stats fields used to find columns with real value differences
+STAT_COLUMNS = ['column', 'unequal_cnt', 'max_diff', 'null_diff']
+
+# Technical metadata columns Domo adds; missing only these is not a schema problem
+BATCH_COLUMNS = frozenset({'_batch_last_run_', '_batch_id_'})
+
+
+def _database_schema() -> tuple:
+    """
+    Lower-cased Snowflake database and schema names from the environment.
+    
+    get_env_config() is already memoized, so this only reads the cached
+    configuration (and still honours clear_env_config_cache()).
+    """
+    env_config = get_env_config()
+    database = env_config.get('SNOWFLAKE_DATABASE') or 'UNKNOWN_DB'
+    schema = env_config.get('SNOWFLAKE_SCHEMA') or 'UNKNOWN_SCHEMA'
+    return database.lower(), schema.lower()
+
+
+def _duplicated_keys(df: pd.DataFrame, join_columns: List[str]) -> pd.Series:
+    """
+    Boolean mask of the rows whose join key appears more than once.
+    
+    A single key column (the usual case) uses Series.duplicated, which skips
+    the multi-column grouping DataFrame.duplicated(subset=...) does.
+    """
+    if len(join_columns) == 1:
+        return df[join_columns[0]].duplicated(keep=False)
+    return df.duplicated(subset=join_columns, keep=False)
+
+
+def _column_sets(comparison: Optional[datacompy.Compare]) -> Optional[Tuple[frozenset, frozenset]]:
+    """Domo (df1) and Snowflake (df2) column sets of a comparison, or None without data."""
+    if comparison and hasattr(comparison, 'df1') and hasattr(comparison, 'df2'):
+        return frozenset(comparison.df1.columns), frozenset(comparison.df2.columns)
+    return None
+
 
 class ExecutiveSummaryGenerator:
     """Generate executive-level summaries of comparison results."""
@@ -20,61 +62,56 @@ class ExecutiveSummaryGenerator:
         """Initialize executive summary generator."""
         self.logger = logging.getLogger("ExecutiveSummaryGenerator")
     
-    def generate_executive_summary(self, report: Dict[str, Any], comparison: Optional[datacompy.Compare] = None) -> str:
+    def generate_executive_summary(self, report: Dict[str, Any], comparison: Optional[datacompy.Compare] = None,
+                                   timestamp: Optional[str] = None) -> str:
         """
         Generate detailed executive summary for comparison results.
         
         Args:
             report: Complete comparison report dictionary
             comparison: Optional datacompy Compare object for direct data access
+            timestamp: Header timestamp, formatted once by batch callers
+                (the current time in SUMMARY_TIMESTAMP_FORMAT if None)
             
         Returns:
             String with detailed executive summary or error information
         """
-        timestamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M")
+        timestamp = timestamp or datetime.now().strftime(SUMMARY_TIMESTAMP_FORMAT)
         dataset_id = report.get('domo_dataset_id', 'N/A')
         table_name = report.get('snowflake_table', 'N/A')
         
-        # Get database and schema from environment configuration
-        env_config = get_env_config()
-        database = env_config.get('SNOWFLAKE_DATABASE', 'UNKNOWN_DB')
-        schema = env_config.get('SNOWFLAKE_SCHEMA', 'UNKNOWN_SCHEMA')
-        
         # Build full table path with real database and schema
-        database_schema_table = f"{database.lower()}.{schema.lower()}.{table_name}"
+        database, schema = _database_schema()
+        database_schema_table = f"{database}.{schema}.{table_name}"
         sampling_method = report.get('data_comparison', {}).get('sampling_method', 'Unknown')
         
         # Track failure reasons for debugging
         failure_reasons = []
         
-        # Debug: Check if comparison object is available
-        self.logger.info(f"🔍 Executive Summary Debug - Comparison object: {comparison is not None}")
+        # Debug: Check if comparison object is available (probes only run at DEBUG level)
         if comparison:
-            self.logger.info(f"🔍 Has column_stats: {hasattr(comparison, 'column_stats')}")
-            if hasattr(comparison, 'column_stats'):
-                self.logger.info(f"🔍 Column_stats is not None: {comparison.column_stats is not None}")
-                if comparison.column_stats is not None:
-                    self.logger.info(f"🔍 Column_stats type: {type(comparison.column_stats)}")
-                    if isinstance(comparison.column_stats, list):
-                        self.logger.info(f"🔍 Column_stats length: {len(comparison.column_stats)}")
-                    elif hasattr(comparison.column_stats, 'shape'):
-                        self.logger.info(f"🔍 Column_stats shape: {comparison.column_stats.shape}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                column_stats = getattr(comparison, 'column_stats', None)
+                self.logger.debug("🔍 Executive Summary Debug - column_stats type: %s, length: %s",
+                                  type(column_stats).__name__,
+                                  len(column_stats) if column_stats is not None else 0)
         else:
+            self.logger.debug("🔍 Executive Summary Debug - Comparison object not available")
             failure_reasons.append("DataComPy comparison object not available")
         
         # Check for major errors
         if report.get('errors'):
-            error_summary = f"[{timestamp}] {sampling_method} - COMPARISON FAILED:\n"
-            error_summary += f"{dataset_id} → {database_schema_table}\n"
-            error_summary += f"❌ Errors encountered:\n"
-            for error in report.get('errors', []):
-                error_summary += f"  • {error}\n"
+            lines: List[str] = [
+                f"[{timestamp}] {sampling_method} - COMPARISON FAILED:",
+                f"{dataset_id} → {database_schema_table}",
+                "❌ Errors encountered:",
+            ]
+            lines.extend(f"  • {error}" for error in report.get('errors', []))
             if failure_reasons:
-                error_summary += f"🔍 Debug info:\n"
-                for reason in failure_reasons:
-                    error_summary += f"  • {reason}\n"
-            error_summary += f"📄 Check detailed logs for more information"
-            return error_summary
+                lines.append("🔍 Debug info:")
+                lines.extend(f"  • {reason}" for reason in failure_reasons)
+            lines.append("📄 Check detailed logs for more information")
+            return "\n".join(lines)
         
         # Overall status
         if report.get('overall_match'):
@@ -89,6 +126,9 @@ class ExecutiveSummaryGenerator:
                 f"{dataset_id} → {database_schema_table}"
             ]
             
+            # Column sets shared by the schema and data analyses
+            column_sets = _column_sets(comparison)
+            
             # Duplicate keys analysis
             duplicate_keys_info = self._analyze_duplicate_keys(comparison)
             if duplicate_keys_info:
@@ -103,11 +143,11 @@ class ExecutiveSummaryGenerator:
                 summary_lines.append(f"❌ Could not compare row counts")
             
             # Schema analysis
-            schema_analysis = self._analyze_schema(report, comparison)
+            schema_analysis = self._analyze_schema(report, comparison, column_sets)
             summary_lines.extend(schema_analysis)
             
             # Data comparison analysis
-            data_analysis = self._analyze_data_differences(report, comparison)
+            data_analysis = self._analyze_data_differences(report, comparison, column_sets)
             summary_lines.extend(data_analysis)
             
             # Add report file reference
@@ -119,20 +159,21 @@ class ExecutiveSummaryGenerator:
         
         except Exception as e:
             # If anything fails during summary generation, return error info
-            failure_summary = f"[{timestamp}] {sampling_method} - SUMMARY GENERATION FAILED:\n"
-            failure_summary += f"{dataset_id} → {database_schema_table}\n"
-            failure_summary += f"💥 Unexpected error: {str(e)}\n"
-            failure_summary += f"🔍 Error type: {type(e).__name__}\n"
+            lines: List[str] = [
+                f"[{timestamp}] {sampling_method} - SUMMARY GENERATION FAILED:",
+                f"{dataset_id} → {database_schema_table}",
+                f"💥 Unexpected error: {str(e)}",
+                f"🔍 Error type: {type(e).__name__}",
+            ]
             if failure_reasons:
-                failure_summary += f"⚠️ Previous issues detected:\n"
-                for reason in failure_reasons:
-                    failure_summary += f"  • {reason}\n"
-            failure_summary += f"📊 Comparison object available: {comparison is not None}\n"
-            failure_summary += f"📊 Report keys: {list(report.keys()) if report else 'None'}\n"
-            failure_summary += f"📄 Check logs and detailed report file for more information"
+                lines.append("⚠️ Previous issues detected:")
+                lines.extend(f"  • {reason}" for reason in failure_reasons)
+            lines.append(f"📊 Comparison object available: {comparison is not None}")
+            lines.append(f"📊 Report keys: {list(report.keys()) if report else 'None'}")
+            lines.append("📄 Check logs and detailed report file for more information")
             
             self.logger.error(f"❌ Executive summary generation failed: {e}")
-            return failure_summary
+            return "\n".join(lines)
     
     def _analyze_duplicate_keys(self, comparison: Optional[datacompy.Compare]) -> str:
         """Analyze duplicate keys in the comparison."""
@@ -143,14 +184,22 @@ class ExecutiveSummaryGenerator:
                 join_columns = getattr(comparison, 'join_columns', [])
                 
                 if join_columns:
-                    # Check for duplicate keys in Domo data (df1)
-                    domo_duplicates = comparison.df1.duplicated(subset=join_columns, keep=False).sum()
-                    # Check for duplicate keys in Snowflake data (df2)  
-                    sf_duplicates = comparison.df2.duplicated(subset=join_columns, keep=False).sum()
+                    # Check for duplicate keys in Domo data (df1); Snowflake data (df2)
+                    # only needs checking when Domo has none
+                    domo_mask = _duplicated_keys(comparison.df1, join_columns)
+                    sf_mask = None
+                    has_duplicates = domo_mask.any()
+                    if not has_duplicates:
+                        sf_mask = _duplicated_keys(comparison.df2, join_columns)
+                        has_duplicates = sf_mask.any()
                     
-                    if domo_duplicates > 0 or sf_duplicates > 0:
+                    if has_duplicates:
                         duplicate_keys_info = f"❌ Duplicate keys detected"
-                        self.logger.info(f"🔍 Duplicate keys found - Domo: {domo_duplicates}, Snowflake: {sf_duplicates}")
+                        # Exact counts are only needed for the log line
+                        if self.logger.isEnabledFor(logging.INFO):
+                            if sf_mask is None:
+                                sf_mask = _duplicated_keys(comparison.df2, join_columns)
+                            self.logger.info(f"🔍 Duplicate keys found - Domo: {domo_mask.sum()}, Snowflake: {sf_mask.sum()}")
                     else:
                         duplicate_keys_info = "✅ Duplicate keys: None found"
                         
@@ -188,29 +237,37 @@ class ExecutiveSummaryGenerator:
         
         return None
     
-    def _analyze_schema(self, report: Dict[str, Any], comparison: Optional[datacompy.Compare]) -> List[str]:
-        """Analyze schema differences."""
+    def _analyze_schema(self, report: Dict[str, Any], comparison: Optional[datacompy.Compare],
+                        column_sets: Optional[Tuple[frozenset, frozenset]] = None) -> List[str]:
+        """
+        Analyze schema differences.
+        
+        Args:
+            report: Complete comparison report dictionary
+            comparison: Optional datacompy Compare object
+            column_sets: Precomputed _column_sets(comparison) (computed here if None)
+            
+        Returns:
+            Summary lines for the schema
+        """
         schema_lines = []
+        if column_sets is None:
+            column_sets = _column_sets(comparison)
         
         # Schema analysis - use datacompy comparison object if available, otherwise fallback to schema comparison
-        if comparison and hasattr(comparison, 'df1') and hasattr(comparison, 'df2'):
+        if column_sets is not None:
             # Extract column information directly from datacompy comparison
             domo_cols = len(comparison.df1.columns)
             sf_cols = len(comparison.df2.columns)
             
-            # Get missing and extra columns directly from dataframes first
-            domo_cols_set = set(comparison.df1.columns)
-            sf_cols_set = set(comparison.df2.columns)
-            missing_cols = list(domo_cols_set - sf_cols_set)
-            extra_cols = list(sf_cols_set - domo_cols_set)
+            # Get missing and extra columns directly from dataframes first (in column order)
+            domo_cols_set, sf_cols_set = column_sets
+            missing_cols = [col for col in comparison.df1.columns if col not in sf_cols_set]
+            extra_cols = [col for col in comparison.df2.columns if col not in domo_cols_set]
             
-            # Special logic for batch columns (technical metadata columns)
-            batch_columns = {'_batch_last_run_', '_batch_id_'}
-            missing_cols_set = set(missing_cols)
-            
-            # Check if missing columns are only batch columns
-            only_batch_missing = missing_cols_set.issubset(batch_columns)
-            has_non_batch_missing = bool(missing_cols_set - batch_columns)
+            # Check if missing columns are only batch columns (technical metadata columns)
+            only_batch_missing = BATCH_COLUMNS.issuperset(missing_cols)
+            has_non_batch_missing = not only_batch_missing
             
             # Add visual indicator for column count comparison with special logic
             if domo_cols == sf_cols:
@@ -252,13 +309,9 @@ class ExecutiveSummaryGenerator:
                 # Get missing columns from schema report for fallback logic
                 missing_cols = schema.get('missing_in_snowflake', [])
                 
-                # Special logic for batch columns (technical metadata columns)
-                batch_columns = {'_batch_last_run_', '_batch_id_'}
-                missing_cols_set = set(missing_cols)
-                
-                # Check if missing columns are only batch columns
-                only_batch_missing = missing_cols_set.issubset(batch_columns)
-                has_non_batch_missing = bool(missing_cols_set - batch_columns)
+                # Check if missing columns are only batch columns (technical metadata columns)
+                only_batch_missing = BATCH_COLUMNS.issuperset(missing_cols)
+                has_non_batch_missing = not only_batch_missing
                 
                 # Add visual indicator for column count comparison with special logic
                 if domo_cols == sf_cols:
@@ -312,9 +365,22 @@ class ExecutiveSummaryGenerator:
         
         return schema_lines
     
-    def _analyze_data_differences(self, report: Dict[str, Any], comparison: Optional[datacompy.Compare]) -> List[str]:
-        """Analyze data value differences."""
+    def _analyze_data_differences(self, report: Dict[str, Any], comparison: Optional[datacompy.Compare],
+                                  column_sets: Optional[Tuple[frozenset, frozenset]] = None) -> List[str]:
+        """
+        Analyze data value differences.
+        
+        Args:
+            report: Complete comparison report dictionary
+            comparison: Optional datacompy Compare object
+            column_sets: Precomputed _column_sets(comparison) (computed here if None)
+            
+        Returns:
+            Summary lines for the data comparison
+        """
         data_lines = []
+        # Set once a row or value difference line (or "All values matched") is added
+        produced_data_summary = False
         
         # Data comparison analysis - simplified approach
         if comparison:
@@ -327,69 +393,36 @@ class ExecutiveSummaryGenerator:
                     data_lines.append(f"❌ Rows Missing in Snowflake: {missing_in_sf}")
                 if extra_in_sf > 0:
                     data_lines.append(f"⚠️ Extra Rows in Snowflake: {extra_in_sf}")
+                produced_data_summary = missing_in_sf > 0 or extra_in_sf > 0
                 
                 # Get columns with different values - more specific approach
                 columns_with_diffs = []
-                self.logger.info(f"🔍 Starting column difference analysis...")
+                debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+                if column_sets is None:
+                    column_sets = _column_sets(comparison)
                 try:
                     # Use column_stats if available, but be more specific about what we count
                     if hasattr(comparison, 'column_stats') and comparison.column_stats is not None:
-                        self.logger.info(f"🔍 Column_stats available, type: {type(comparison.column_stats)}")
-                        if isinstance(comparison.column_stats, list):
-                            self.logger.info(f"🔍 Processing list with {len(comparison.column_stats)} elements")
-                            
-                            # Debug: Show first few entries
-                            if len(comparison.column_stats) > 0:
-                                self.logger.info(f"🔍 First column_stat entry: {comparison.column_stats[0]}")
-                            
-                            # Get common columns
-                            common_cols = set(comparison.df1.columns) & set(comparison.df2.columns)
-                            self.logger.info(f"🔍 Common columns count: {len(common_cols)}")
-                            
-                            # Only count columns that have actual value differences, not just type mismatches
-                            # Filter for columns that have real data differences (not just type differences)
-                            columns_with_diffs = []
-                            for stat in comparison.column_stats:
-                                col_name = stat.get('column')
-                                unequal_cnt = stat.get('unequal_cnt', 0)
-                                max_diff = stat.get('max_diff', 0)
-                                null_diff = stat.get('null_diff', 0)
-                                
-                                # Only include if:
-                                # 1. Column is in common columns
-                                # 2. Has unequal values > 0 
-                                # 3. AND either has max_diff > 0 OR null_diff > 0 (real value differences)
-                                if (col_name in common_cols and 
-                                    unequal_cnt > 0 and 
-                                    (max_diff > 0 or null_diff > 0)):
-                                    columns_with_diffs.append(col_name)
-                                    self.logger.info(f"🔍 Column '{col_name}': unequal={unequal_cnt}, max_diff={max_diff}, null_diff={null_diff}")
-                                elif col_name in common_cols and unequal_cnt > 0:
-                                    self.logger.info(f"🔍 SKIPPED '{col_name}': unequal={unequal_cnt}, max_diff={max_diff}, null_diff={null_diff} (type-only difference)")
-                            
-                            # Log more details about what we found
-                            all_unequal_cols = [s for s in comparison.column_stats if s.get('unequal_cnt', 0) > 0]
-                            type_only_diffs = len(all_unequal_cols) - len(columns_with_diffs)
+                        if isinstance(comparison.column_stats, list) or hasattr(comparison.column_stats, 'shape'):
+                            # One frame for both shapes of column_stats; stats missing a field count as 0
+                            stats = pd.DataFrame(comparison.column_stats).reindex(columns=STAT_COLUMNS)
+                            stats[STAT_COLUMNS[1:]] = stats[STAT_COLUMNS[1:]].fillna(0)
+                            common_cols = list(column_sets[0] & column_sets[1])
                             
-                            self.logger.info(f"🔍 SUMMARY:")
-                            self.logger.info(f"  📊 Total columns with unequal_cnt > 0: {len(all_unequal_cols)}")
-                            self.logger.info(f"  📊 Columns with type-only differences: {type_only_diffs}")
-                            self.logger.info(f"  📊 Columns with real value differences: {len(columns_with_diffs)}")
-                            self.logger.info(f"🔍 Final filtered columns with differences: {columns_with_diffs}")
+                            # Only count columns that have actual value differences, not just type mismatches:
+                            # a common column with unequal values AND either max_diff > 0 or null_diff > 0
+                            unequal = stats['column'].isin(common_cols) & (stats['unequal_cnt'] > 0)
+                            real_diff = (stats['max_diff'] > 0) | (stats['null_diff'] > 0)
+                            columns_with_diffs = stats.loc[unequal & real_diff, 'column'].tolist()
                             
-                        elif hasattr(comparison.column_stats, 'shape'):  # DataFrame case
-                            self.logger.info(f"🔍 Processing DataFrame with shape: {comparison.column_stats.shape}")
-                            # Filter for common columns only and real value differences
-                            common_cols = set(comparison.df1.columns) & set(comparison.df2.columns)
-                            mask = (
-                                (comparison.column_stats['unequal_cnt'] > 0) & 
-                                (comparison.column_stats['column'].isin(common_cols)) &
-                                ((comparison.column_stats['max_diff'] > 0) | (comparison.column_stats['null_diff'] > 0))
-                            )
-                            columns_with_diffs = comparison.column_stats[mask]['column'].tolist()
-                            self.logger.info(f"🔍 DataFrame filtered columns with real differences: {len(columns_with_diffs)}")
+                            if debug_enabled:
+                                for row in stats[unequal].itertuples(index=False):
+                                    self.logger.debug("🔍 %s '%s': unequal=%s, max_diff=%s, null_diff=%s",
+                                                      "Column" if row.column in columns_with_diffs else "SKIPPED (type-only difference)",
+                                                      row.column, row.unequal_cnt, row.max_diff, row.null_diff)
+                            self.logger.debug("🔍 Columns with real value differences: %s", columns_with_diffs)
                     else:
-                        self.logger.info(f"🔍 Column_stats not available or None")
+                        self.logger.debug("🔍 Column_stats not available or None")
                 except Exception as e:
                     self.logger.error(f"❌ Error analyzing column differences: {e}")
                     import traceback
@@ -405,12 +438,13 @@ class ExecutiveSummaryGenerator:
                 else:
                     data_lines.append(f"⚠️ Columns with Different Values: {', '.join(columns_with_diffs[:5])}")
                     data_lines.append(f"... and {len(columns_with_diffs) - 5} more columns with differences")
+                produced_data_summary = True
                 
             except Exception as e:
                 data_lines.append(f"❌ Could not analyze data differences: {str(e)}")
         
         # Fallback: use report data if comparison object failed
-        if not data_lines or len([line for line in data_lines if 'Different Values' in line or 'Missing' in line or 'Extra' in line or 'All values matched' in line]) == 0:
+        if not produced_data_summary:
             data = report.get('data_comparison', {})
             if data and not data.get('error'):
                 if data.get('missing_in_snowflake', 0) > 0:
@@ -6,8 +6,8 @@ for data comparison results.
 """
 
 import logging
+from datetime import datetime
 from typing import Dict, Any, List
-import pandas as pd
 
 
 class ReportGenerator:
@@ -86,6 +86,8 @@ class ReportGenerator:
         print(f"\n🔍 DATA COMPARISON:")
         if data.get('error'):
             print("   ❌ Error comparing data")
+        elif data.get('skipped'):
+            print("   ⏭️  Skipped: schema or row count already mismatched")
         else:
             print(f"   Sample size: {data['sample_size']:,}")
             print(f"   Domo sample rows: {data['domo_sample_rows']:,}")
@@ -117,6 +119,6 @@ class ReportGenerator:
             'key_columns': key_columns,
             'overall_match': False,
             'errors': [{'section': 'Connection', 'error': 'Failed to setup connections', 'details': ''}],
-            'timestamp': pd.Timestamp.now().isoformat(),
+            'timestamp': datetime.now().isoformat(),
             'transform_applied': transform_names
         }
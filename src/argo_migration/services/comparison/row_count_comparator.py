@@ -6,10 +6,11 @@ of differences between datasets.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from ...api.domo import DomoHandler
 from ...api.snowflake import SnowflakeHandler
+from .domo_cache import DomoCache, get_domo_row_count
 
 
 class RowCountComparator:
@@ -27,15 +28,14 @@ class RowCountComparator:
         self.snowflake_handler = snowflake_handler
         self.logger = logging.getLogger("RowCountComparator")
     
-    def compare_row_counts(self, domo_dataset_id: str, snowflake_table: str) -> Dict[str, Any]:
+    def compare_row_counts(self, domo_dataset_id: str, snowflake_table: str,
+                           domo_cache: Optional[DomoCache] = None) -> Dict[str, Any]:
         """Compare row counts between Domo and Snowflake."""
         self.logger.info("📊 Comparing row counts...")
         
         # Get Domo count using DomoHandler for simple queries
         try:
-            domo_count_query = "SELECT COUNT(*) as row_count FROM table"
-            domo_result = self.domo_handler.query_dataset(domo_dataset_id, domo_count_query)
-            domo_count = domo_result['rows'][0][0] if domo_result['rows'] else 0
+            domo_count = get_domo_row_count(self.domo_handler, domo_dataset_id, domo_cache)
         except Exception as e:
             self.logger.error(f"❌ Could not get row count from Domo: {e}")
             domo_count = 0
@@ -7,12 +7,13 @@ column names for downstream sampling/query building.
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from ...utils.common import transform_column_name, get_env_config
 from ...api.domo import DomoHandler
 from ...api.snowflake import SnowflakeHandler
 from ...utils.column_matcher import ColumnMatcher
+from .domo_cache import DomoCache, get_domo_schema
 
 
 class SchemaComparator:
@@ -28,7 +29,8 @@ class SchemaComparator:
         self.column_matcher = ColumnMatcher()
         self.intelligent_mapping: Dict[str, Dict[str, any]] = {}
 
-    def compare_schemas(self, domo_dataset_id: str, snowflake_table: str, transform_names: bool = False, use_intelligent_mapping: bool = False) -> Dict[str, Any]:
+    def compare_schemas(self, domo_dataset_id: str, snowflake_table: str, transform_names: bool = False, use_intelligent_mapping: bool = False,
+                        domo_cache: Optional[DomoCache] = None) -> Dict[str, Any]:
         """
         Compare Domo dataset schema vs Snowflake table schema.
 
@@ -37,13 +39,14 @@ class SchemaComparator:
             snowflake_table: Snowflake table name (unqualified; env provides DB/SCHEMA)
             transform_names: Whether to consider name normalization applied
             use_intelligent_mapping: Whether to use intelligent column mapping with Levenshtein
+            domo_cache: Optional per-run cache of Domo metadata keyed by dataset ID
 
         Returns:
             Dict with schema comparison details.
         """
         try:
             # Fetch Domo schema
-            domo_schema = self.domo_handler.get_dataset_schema(domo_dataset_id) or {"columns": []}
+            domo_schema = get_domo_schema(self.domo_handler, domo_dataset_id, domo_cache) or {"columns": []}
             domo_columns_original: List[str] = [c.get("name", "") for c in domo_schema.get("columns", []) if c.get("name")]
 
             # Fetch Snowflake columns using helper
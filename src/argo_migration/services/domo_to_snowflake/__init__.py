@@ -22,6 +22,9 @@ Usage:
         # Migrate single dataset
         success = orchestrator.migrate_dataset('dataset_id')
         
+        # Stream a large dataset in 50k-row chunks
+        success = orchestrator.migrate_dataset('dataset_id', chunk_rows=50000)
+        
         # Migrate multiple datasets
         configs = [
             {'dataset_id': 'id1', 'dataset_name': 'Dataset 1'},
@@ -32,12 +35,14 @@ Usage:
 
 # Main interface
 from .migration_orchestrator import MigrationOrchestrator
+from .chunked_migration import ChunkedMigration
 
 # Utilities
 from .table_utils import sanitize_table_name, validate_table_name, generate_table_name_variants
 
 __all__ = [
     'MigrationOrchestrator',
+    'ChunkedMigration',
     'sanitize_table_name',
     'validate_table_name', 
     'generate_table_name_variants'
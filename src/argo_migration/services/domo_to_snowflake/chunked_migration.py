@@ -0,0 +1,166 @@
+"""Chunked producer/consumer migration from Domo to Snowflake."""
+
+import logging
+import queue
+import threading
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the chunk stream on the queue
+_END_OF_STREAM = object()
+
+
+class ChunkedMigration:
+    """
+    Stream a Domo dataset into Snowflake without materializing it in memory.
+
+    A producer thread pages through the Domo dataset and pushes each chunk onto a
+    bounded queue while the calling thread uploads chunks as they arrive, so peak
+    memory is roughly ``chunk_rows * max_queued_chunks`` rows instead of the full
+    dataset.
+
+    Pages are read with LIMIT/OFFSET over a stable ORDER BY, so every query sees
+    the rows in the same order and no row is skipped or read twice.
+    """
+
+    def __init__(self, domo_handler, snowflake_handler, chunk_rows: int = 50000,
+                 max_queued_chunks: int = 4, order_by: Optional[List[str]] = None):
+        """
+        Initialize the chunked migration.
+
+        Args:
+            domo_handler: Authenticated Domo handler
+            snowflake_handler: Connected Snowflake handler
+            chunk_rows: Number of rows extracted from Domo per chunk
+            max_queued_chunks: Maximum number of extracted chunks waiting for upload
+            order_by: Columns that uniquely identify a row, used to order the pages.
+                If None, pages are ordered by every column of the dataset.
+        """
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be a positive integer")
+
+        self.domo = domo_handler
+        self.snowflake = snowflake_handler
+        self.chunk_rows = chunk_rows
+        self.max_queued_chunks = max_queued_chunks
+        self.order_by = order_by
+
+    def _order_by_clause(self, dataset_id: str) -> str:
+        """
+        ORDER BY column list giving the dataset a deterministic row order.
+
+        Ordering by every column makes rows that tie identical, so pages cannot
+        differ between queries even without a unique key.
+        """
+        # Imported here so the migration service does not load the comparison package
+        from ..comparison.sampling.query_builder import escape_domo_column_list
+
+        columns = self.order_by
+        if not columns:
+            schema = self.domo.get_dataset_schema(dataset_id) or []
+            if isinstance(schema, dict):
+                schema = schema.get('columns', [])
+            columns = [column.get('name') for column in schema if column.get('name')]
+        if not columns:
+            raise RuntimeError(f"Could not read the columns of dataset {dataset_id} to order its chunks")
+        return escape_domo_column_list(columns)
+
+    def iter_chunks(self, dataset_id: str) -> Iterator[pd.DataFrame]:
+        """Yield the Domo dataset as consecutive DataFrame chunks (in a stable order)."""
+        order_by = self._order_by_clause(dataset_id)
+        offset = 0
+        while True:
+            query = f"SELECT * FROM table ORDER BY {order_by} LIMIT {self.chunk_rows} OFFSET {offset}"
+            df = self.domo.extract_data(dataset_id, query=query)
+
+            if df is None:
+                raise RuntimeError(f"Failed to extract rows {offset}+ from dataset {dataset_id}")
+            if df.empty:
+                return
+
+            yield df
+            offset += self.chunk_rows
+
+    def migrate(self, dataset_id: str, table_name: str) -> bool:
+        """
+        Migrate a dataset chunk by chunk.
+
+        Args:
+            dataset_id: Domo dataset ID
+            table_name: Target Snowflake table name
+
+        Returns:
+            bool: True if migration successful, False otherwise
+        """
+        chunks: queue.Queue = queue.Queue(maxsize=self.max_queued_chunks)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for chunk in self.iter_chunks(dataset_id):
+                    while not stop.is_set():
+                        try:
+                            chunks.put(chunk, timeout=1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(_END_OF_STREAM)
+
+        logger.info(f"🔀 Streaming dataset {dataset_id} in chunks of {self.chunk_rows:,} rows")
+        producer = threading.Thread(target=produce, name=f"domo-extract-{dataset_id}", daemon=True)
+        producer.start()
+
+        total_rows = 0
+        chunk_number = 0
+        success = True
+
+        try:
+            while True:
+                item = chunks.get()
+                if item is _END_OF_STREAM:
+                    break
+                if isinstance(item, Exception):
+                    logger.error(f"❌ Failed to extract data from dataset {dataset_id}: {item}")
+                    success = False
+                    break
+
+                chunk_number += 1
+                # First chunk replaces/creates the table, subsequent chunks append
+                if_exists = 'replace' if chunk_number == 1 else 'append'
+                logger.info(f"📦 Uploading chunk {chunk_number} ({len(item):,} rows) to {table_name}")
+
+                if not self.snowflake.upload_data(item, table_name, if_exists=if_exists):
+                    logger.error(f"❌ Failed to upload chunk {chunk_number} to Snowflake")
+                    success = False
+                    break
+
+                total_rows += len(item)
+        finally:
+            stop.set()
+            # Drain so a producer blocked on put() can reach the end of stream
+            while producer.is_alive() or not chunks.empty():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+
+        if not success:
+            return False
+
+        if chunk_number == 0:
+            logger.warning(f"⚠️  Dataset {dataset_id} is empty")
+            return True  # Empty dataset is not an error
+
+        logger.info(f"✅ Uploaded {total_rows:,} rows in {chunk_number} chunks")
+
+        logger.info(f"🔍 Verifying upload...")
+        return self.snowflake.verify_upload(table_name, total_rows)
@@ -5,6 +5,7 @@ from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
 from .table_utils import sanitize_table_name, validate_table_name
+from .chunked_migration import ChunkedMigration
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,8 @@ class MigrationOrchestrator:
         self.snowflake = snowflake_handler
     
     def migrate_dataset(self, dataset_id: str, dataset_name: str = None, 
-                       table_name: str = None, chunk_size: int = None) -> bool:
+                       table_name: str = None, chunk_size: int = None,
+                       chunk_rows: int = None) -> bool:
         """
         Migrate a single dataset from Domo to Snowflake.
         
@@ -33,6 +35,8 @@ class MigrationOrchestrator:
             dataset_name: Dataset name (optional)
             table_name: Custom table name (optional)
             chunk_size: Data extraction chunk size
+            chunk_rows: If set, stream the dataset in chunks of this many rows
+                instead of loading it fully into memory
             
         Returns:
             bool: True if migration successful, False otherwise
@@ -49,6 +53,14 @@ class MigrationOrchestrator:
                 logger.error(f"❌ Invalid table name: {table_name}")
                 return False
             
+            if chunk_rows:
+                success = ChunkedMigration(self.domo, self.snowflake, chunk_rows).migrate(dataset_id, table_name)
+                if success:
+                    logger.info(f"🎉 Migration completed successfully for {dataset_id}")
+                else:
+                    logger.error(f"❌ Chunked migration failed for {dataset_id}")
+                return success
+            
             # Extract data from Domo
             logger.info(f"📥 Extracting data from Domo...")
             df = self.domo.extract_data(dataset_id, chunk_size=chunk_size or 1000000)
@@ -116,13 +128,15 @@ class MigrationOrchestrator:
             # Extract configuration
             table_name = config.get('table_name')
             chunk_size = config.get('chunk_size')
+            chunk_rows = config.get('chunk_rows')
             
             # Perform migration
             success = self.migrate_dataset(
                 dataset_id=dataset_id,
                 dataset_name=dataset_name,
                 table_name=table_name,
-                chunk_size=chunk_size
+                chunk_size=chunk_size,
+                chunk_rows=chunk_rows
             )
             
             results[dataset_id] = success
@@ -7,7 +7,9 @@ across multiple components in the migration pipeline.
 
 import os
 import re
+import time
 import logging
+from functools import lru_cache
 from typing import TypedDict, List, Optional, Dict
 from dotenv import load_dotenv
 
@@ -46,10 +48,14 @@ class QueryResult(TypedDict):
     rows: list[list]
 
 
+@lru_cache(maxsize=4096)
 def transform_column_name(column_name: str) -> str:
     """
     Transform Domo column names to match Snowflake naming conventions.
     
+    Results are memoized: the same names are transformed again and again by the
+    schema comparison, query building and data comparison steps.
+    
     Args:
         column_name: Original column name from Domo
         
@@ -177,13 +183,42 @@ def mask_sensitive_value(value: str, visible_chars: int = 2) -> str:
     return value[:visible_chars] + '*' * (len(value) - visible_chars)
 
 
+# Lowercased strings accepted as "on" for boolean settings and spreadsheet flags
+TRUTHY_VALUES = frozenset({'true', '1', 'yes', 'y', 'enabled'})
+
+# get_env_config() results are reused for this many seconds
+ENV_CONFIG_TTL_SECONDS = 30
+_env_config_cache: Optional[tuple] = None  # (monotonic timestamp, config)
+
+
 def get_env_config() -> Dict[str, Optional[str]]:
     """
     Get all environment configuration in one place.
     
+    The configuration is read once and reused for ENV_CONFIG_TTL_SECONDS, so bulk
+    runners and comparators asking for it repeatedly don't rebuild it each time.
+    Call clear_env_config_cache() after changing the environment.
+    
     Returns:
-        Dictionary with all environment variables
+        Dictionary with all environment variables (a copy, safe to modify)
     """
+    global _env_config_cache
+    
+    now = time.monotonic()
+    if _env_config_cache is None or now - _env_config_cache[0] >= ENV_CONFIG_TTL_SECONDS:
+        _env_config_cache = (now, _read_env_config())
+    
+    return dict(_env_config_cache[1])
+
+
+def clear_env_config_cache():
+    """Forget the memoized get_env_config() result."""
+    global _env_config_cache
+    _env_config_cache = None
+
+
+def _read_env_config() -> Dict[str, Optional[str]]:
+    """Read the configuration from environment variables."""
     return {
         # Snowflake configuration
         'SNOWFLAKE_USER': os.getenv('SNOWFLAKE_USER'),
@@ -214,6 +249,10 @@ def get_env_config() -> Dict[str, Optional[str]]:
         
         # Comparison configuration
         'TRANSFORM_COLUMNS': os.getenv('TRANSFORM_COLUMNS'),
+        'COMPARISON_STATUS_WRITEBACK': os.getenv('COMPARISON_STATUS_WRITEBACK', 'false'),
+        'COMPARISON_EARLY_EXIT': os.getenv('COMPARISON_EARLY_EXIT', 'false'),
+        'DEBUG_EXPORT_FORMAT': os.getenv('DEBUG_EXPORT_FORMAT', 'parquet'),
+        'DEBUG_EXPORT_OPTIMIZE_DTYPES': os.getenv('DEBUG_EXPORT_OPTIMIZE_DTYPES', 'false'),
     }
 
 
@@ -237,8 +276,7 @@ def get_transform_columns_setting(cli_arg: Optional[bool] = None) -> bool:
     # Priority 2: Environment variable
     env_value = os.getenv('TRANSFORM_COLUMNS')
     if env_value:
-        env_value_lower = env_value.lower()
-        return env_value_lower in ['true', '1', 'yes', 'y', 'enabled']
+        return env_value.strip().lower() in TRUTHY_VALUES
     
     # Priority 3: Default
     return False
@@ -320,6 +358,7 @@ def reload_environment():
     try:
         from ..api.snowflake import reload_env_vars
         reload_env_vars()
+        clear_env_config_cache()
         show_mfa_debug_info()
     except ImportError:
         logger.warning("Environment reload utilities not available") 
\ No newline at end of file
@@ -1,5 +1,12 @@
 import re
 
+# Basic schema used for demo STG generation (shared by cli.py and cli_simple.py)
+BASIC_STG_SCHEMA = [
+    {'name': 'id', 'type': 'STRING'},
+    {'name': 'created_date', 'type': 'DATE'},
+    {'name': 'value', 'type': 'NUMBER'}
+]
+
 def create_stg_sql_file(columns: list[dict], source_schema_name: str, source_table_name: str, output_filename: str = "file.sql", use_cast: bool = False) -> str:
     """
     Crea un archivo SQL de staging a partir de una lista de columnas con sus tipos de datos.
@@ -1,17 +1,17 @@
 import os.path
 import logging
-from typing import Any, List, Optional, Dict, TypedDict, Union, cast, TYPE_CHECKING
+from functools import lru_cache
+from typing import Any, List, Optional, Dict, Tuple, TypedDict, Union, cast, TYPE_CHECKING
 from os import getenv
 
-from google.auth.transport.requests import Request
+from google.auth.transport.requests import Request, AuthorizedSession
 from google.oauth2.credentials import Credentials
 from google.oauth2 import service_account
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build, Resource
 from googleapiclient.errors import HttpError
 
-import polars as pl
-import pandas as pd  # Still needed for compatibility
+import pandas as pd
 
 # Import types from stubs only for type checking
 if TYPE_CHECKING:
@@ -24,10 +24,22 @@ if TYPE_CHECKING:
         Spreadsheet,
     )
 
+def column_letter(index: int) -> str:
+    """Convert a 0-based column index to its A1 column letter (0 -> 'A', 26 -> 'AA')."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
 # Default scopes for read-only access, can be expanded as needed
 DEFAULT_SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
 # For read and write access
 READ_WRITE_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+# Drive file metadata (e.g. modifiedTime) without content access
+DRIVE_METADATA_SCOPE = "https://www.googleapis.com/auth/drive.metadata.readonly"
 
 
 class GoogleSheets:
@@ -65,6 +77,9 @@ class GoogleSheets:
             # Use cast() instead of type comment
             service = cast("SheetsResource", build("sheets", "v4", credentials=creds))
             self.sheet = service.spreadsheets()
+            self._creds = creds
+            self._drive_files = None
+            self._session = None
             self.logger.info(
                 "Successfully authenticated with Google Sheets API using service account"
             )
@@ -95,6 +110,111 @@ class GoogleSheets:
             self.logger.error(f"Error reading range: {err}")
             return []
 
+    def read_ranges(
+        self, spreadsheet_id: str, ranges: List[str], major_dimension: str = "ROWS"
+    ) -> List[List[List[Any]]]:
+        """
+        Read several ranges of a spreadsheet in a single values.batchGet request
+
+        Args:
+            spreadsheet_id (str): The ID of the spreadsheet
+            ranges (List[str]): The ranges to read (e.g., ['Sheet1!A2:A', 'Sheet1!D2:D'])
+            major_dimension (str): 'ROWS' or 'COLUMNS', how values are grouped in each range
+
+        Returns:
+            List[List[List[Any]]]: The values of each range, in request order
+        """
+        try:
+            result = (
+                self.sheet.values()
+                .batchGet(
+                    spreadsheetId=spreadsheet_id,
+                    ranges=ranges,
+                    majorDimension=major_dimension,
+                )
+                .execute()
+            )
+            value_ranges = result.get("valueRanges", [])
+            return [value_range.get("values", []) for value_range in value_ranges]
+        except HttpError as err:
+            self.logger.error(f"Error reading ranges: {err}")
+            return []
+
+    def export_csv(self, spreadsheet_id: str, sheet_name: str) -> Optional[bytes]:
+        """
+        Export a single sheet as CSV bytes
+
+        Drive's files.export only returns the first sheet, so this uses the
+        spreadsheet export endpoint with the sheet's gid. Returns None when the
+        export is not permitted (e.g. 403) so callers can fall back to read_range.
+
+        Args:
+            spreadsheet_id (str): The ID of the spreadsheet
+            sheet_name (str): The title of the sheet to export
+
+        Returns:
+            Optional[bytes]: The CSV content, or None
+        """
+        try:
+            result = self.sheet.get(
+                spreadsheetId=spreadsheet_id, fields="sheets.properties(sheetId,title)"
+            ).execute()
+            gid = next(
+                (
+                    sheet["properties"]["sheetId"]
+                    for sheet in result.get("sheets", [])
+                    if sheet["properties"].get("title") == sheet_name
+                ),
+                None,
+            )
+            if gid is None:
+                self.logger.warning(f"Sheet '{sheet_name}' not found for CSV export")
+                return None
+
+            if self._session is None:
+                self._session = AuthorizedSession(self._creds)
+            response = self._session.get(
+                f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/export",
+                params={"format": "csv", "gid": gid},
+                timeout=60,
+            )
+            if response.status_code != 200:
+                self.logger.warning(
+                    f"CSV export unavailable (HTTP {response.status_code}), falling back to values API"
+                )
+                return None
+            return response.content
+        except Exception as err:
+            self.logger.warning(f"CSV export failed: {err}")
+            return None
+
+    def get_modified_time(self, spreadsheet_id: str) -> Optional[str]:
+        """
+        Get the last modification time of a spreadsheet from the Drive API
+
+        Requires DRIVE_METADATA_SCOPE; returns None when the metadata is not
+        accessible so callers can fall back to reading the data.
+
+        Args:
+            spreadsheet_id (str): The ID of the spreadsheet
+
+        Returns:
+            Optional[str]: RFC 3339 modification timestamp, or None
+        """
+        if DRIVE_METADATA_SCOPE not in self.scopes:
+            return None
+
+        try:
+            if self._drive_files is None:
+                self._drive_files = build("drive", "v3", credentials=self._creds).files()
+            result = self._drive_files.get(
+                fileId=spreadsheet_id, fields="modifiedTime", supportsAllDrives=True
+            ).execute()
+            return result.get("modifiedTime")
+        except Exception as err:
+            self.logger.warning(f"Could not get spreadsheet modification time: {err}")
+            return None
+
     def read_to_dataframe(
         self, spreadsheet_id: str, range_name: str, header: bool = True
     ) -> pd.DataFrame:
@@ -170,6 +290,46 @@ class GoogleSheets:
             self.logger.error(f"Error writing to range: {err}")
             raise
 
+    def batch_update_values(
+        self,
+        spreadsheet_id: str,
+        data: List[Dict[str, Any]],
+        value_input_option: str = "USER_ENTERED",
+    ) -> Dict[str, Any]:
+        """
+        Write several ranges in a single values.batchUpdate request
+
+        Args:
+            spreadsheet_id (str): The ID of the spreadsheet
+            data (List[Dict[str, Any]]): Value ranges, e.g. [{"range": "Sheet1!F2", "values": [["x"]]}]
+            value_input_option (str): 'USER_ENTERED' to parse input like the UI, 'RAW' to store as-is
+
+        Returns:
+            Dict[str, Any]: The BatchUpdateValuesResponse from the API
+        """
+        if "https://www.googleapis.com/auth/spreadsheets" not in self.scopes:
+            self.logger.error(
+                "Write operation requires read-write scope. Please initialize with READ_WRITE_SCOPES"
+            )
+            raise PermissionError(
+                "Write operation requires read-write scope. Please initialize with READ_WRITE_SCOPES"
+            )
+
+        try:
+            body = {"valueInputOption": value_input_option, "data": data}
+            result = (
+                self.sheet.values()
+                .batchUpdate(spreadsheetId=spreadsheet_id, body=body)
+                .execute()
+            )
+            self.logger.info(
+                f"Updated {result.get('totalUpdatedCells')} cells in {len(data)} ranges"
+            )
+            return result
+        except HttpError as err:
+            self.logger.error(f"Error batch writing ranges: {err}")
+            raise
+
     def write_dataframe(
         self,
         df: pd.DataFrame,
@@ -303,4 +463,29 @@ class GoogleSheets:
             return result
         except HttpError as err:
             self.logger.error(f"Error getting sheet properties: {err}")
-            raise
\ No newline at end of file
+            raise
+
+
+@lru_cache(maxsize=None)
+def _cached_client(credentials_path: str, scopes: Tuple[str, ...]) -> GoogleSheets:
+    return GoogleSheets(credentials_path=credentials_path, scopes=list(scopes))
+
+
+def get_gsheets_client(
+    credentials_path: str, scopes: List[str] = DEFAULT_SCOPES
+) -> GoogleSheets:
+    """
+    Get a GoogleSheets client shared across the process
+
+    Clients are cached per (credentials file, scopes), so repeated runs reuse
+    the authenticated service instead of re-reading credentials and rebuilding
+    the API client each time. Clients are not thread-safe; use them from one thread.
+
+    Args:
+        credentials_path (str): Path to the service account JSON file
+        scopes (List[str]): List of scopes to request
+
+    Returns:
+        GoogleSheets: The shared client
+    """
+    return _cached_client(os.path.abspath(credentials_path), tuple(scopes))